@@ -63,6 +63,13 @@ PYBIND11_MODULE(core, m) {
             for (const auto& e : m.edges) ids.push_back(e.target_id);
             return ids;
         })
+        // Sizes without materializing the dict/list copy (cheap emptiness checks)
+        .def_property_readonly("attributes_len", [](const feather::Metadata& m) {
+            return m.attributes.size();
+        })
+        .def_property_readonly("links_len", [](const feather::Metadata& m) {
+            return m.edges.size();
+        })
         // Phase 6 fields
         .def_readwrite("ttl",        &feather::Metadata::ttl)
         .def_readwrite("confidence", &feather::Metadata::confidence)
@@ -73,6 +80,11 @@ PYBIND11_MODULE(core, m) {
             m.attributes[key] = value;
         }, py::arg("key"), py::arg("value"),
         "Set a single attribute key-value pair.")
+        .def("set_attributes", [](feather::Metadata& m,
+                                   const std::unordered_map<std::string, std::string>& attrs) {
+            for (const auto& [key, value] : attrs) m.attributes[key] = value;
+        }, py::arg("attrs"),
+        "Set many attributes from a dict in one call (merged into existing ones).")
         .def("get_attribute", [](const feather::Metadata& m,
                                   const std::string& key,
                                   const std::string& default_val) {
@@ -103,7 +115,15 @@ PYBIND11_MODULE(core, m) {
         .def_readwrite("tags_contains",    &feather::SearchFilter::tags_contains)
         .def_readwrite("namespace_id",     &feather::SearchFilter::namespace_id)
         .def_readwrite("entity_id",        &feather::SearchFilter::entity_id)
-        .def_readwrite("attributes_match", &feather::SearchFilter::attributes_match);
+        .def_readwrite("attributes_match", &feather::SearchFilter::attributes_match)
+        // Avoids the pybind11 map/dict copy of read-modify-write on attributes_match
+        .def("add_attribute_match", [](feather::SearchFilter& f,
+                                        const std::string& key,
+                                        const std::string& value) {
+            if (!f.attributes_match) f.attributes_match.emplace();
+            (*f.attributes_match)[key] = value;
+        }, py::arg("key"), py::arg("value"),
+        "Require attribute `key` to equal `value` (added to any existing matches).");
 
     // ── SearchResult ─────────────────────────────────────────────────
     py::class_<feather::DB::SearchResult>(m, "SearchResult")
@@ -132,7 +152,8 @@ PYBIND11_MODULE(core, m) {
     // ── DB ───────────────────────────────────────────────────────────
     py::class_<feather::DB, std::unique_ptr<feather::DB, py::nodelete>>(m, "DB")
         .def_static("open", &feather::DB::open,
-                    py::arg("path"), py::arg("dim") = 768)
+                    py::arg("path"), py::arg("dim") = 768,
+                    py::call_guard<py::gil_scoped_release>())   // file load + HNSW rebuild
 
         // -- Ingestion --
         .def("add", [](feather::DB& db, uint64_t id,
@@ -142,6 +163,7 @@ PYBIND11_MODULE(core, m) {
             auto buf = vec.request();
             const float* ptr = static_cast<const float*>(buf.ptr);
             std::vector<float> v(ptr, ptr + buf.size);
+            py::gil_scoped_release rel;   // HNSW insert + WAL append
             db.add(id, v, meta ? *meta : feather::Metadata(), modality);
         }, py::arg("id"), py::arg("vec"),
            py::arg("meta") = std::nullopt,
@@ -182,17 +204,129 @@ PYBIND11_MODULE(core, m) {
             auto buf = q.request();
             const float* ptr = static_cast<const float*>(buf.ptr);
             std::vector<float> query(ptr, ptr + buf.size);
+            py::gil_scoped_release rel;   // results are converted after the GIL is back
             return db.search(query, k, filter, scoring, modality);
         }, py::arg("q"), py::arg("k") = 5,
            py::arg("filter") = nullptr, py::arg("scoring") = nullptr,
            py::arg("modality") = "text")
 
+        .def("search_columnar", [](feather::DB& db, py::array_t<float> q, size_t k,
+                                    const feather::SearchFilter* filter,
+                                    const feather::ScoringConfig* scoring,
+                                    const std::string& modality) {
+            auto buf = q.request();
+            const float* ptr = static_cast<const float*>(buf.ptr);
+            std::vector<float> query(ptr, ptr + buf.size);
+            std::vector<feather::DB::SearchResult> res;
+            {
+                py::gil_scoped_release rel;
+                res = db.search(query, k, filter, scoring, modality);
+            }
+            // One dict of parallel columns instead of k SearchResult/Metadata
+            // objects whose every field read is a separate FFI call.
+            const size_t n = res.size();
+            py::array_t<uint64_t> ids(n), last_recalled_at(n);
+            py::array_t<float>    scores(n), importance(n);
+            py::array_t<int64_t>  timestamp(n);
+            py::array_t<int32_t>  type(n);
+            py::array_t<uint32_t> recall_count(n);
+            auto id_p = ids.mutable_data();          auto lr_p = last_recalled_at.mutable_data();
+            auto sc_p = scores.mutable_data();       auto im_p = importance.mutable_data();
+            auto ts_p = timestamp.mutable_data();    auto ty_p = type.mutable_data();
+            auto rc_p = recall_count.mutable_data();
+            py::list source(n), content(n), tags_json(n), namespace_id(n),
+                     entity_id(n), attributes(n), links(n);
+            for (size_t i = 0; i < n; ++i) {
+                const auto& r = res[i];
+                const auto& m = r.metadata;
+                id_p[i] = r.id;                 sc_p[i] = r.score;
+                ts_p[i] = m.timestamp;          im_p[i] = m.importance;
+                ty_p[i] = static_cast<int32_t>(m.type);
+                rc_p[i] = m.recall_count;       lr_p[i] = m.last_recalled_at;
+                source[i]       = py::str(m.source);
+                content[i]      = py::str(m.content);
+                tags_json[i]    = py::str(m.tags_json);
+                namespace_id[i] = py::str(m.namespace_id);
+                entity_id[i]    = py::str(m.entity_id);
+                attributes[i]   = py::cast(m.attributes);
+                py::list l(m.edges.size());
+                for (size_t j = 0; j < m.edges.size(); ++j) l[j] = m.edges[j].target_id;
+                links[i] = std::move(l);
+            }
+            py::dict out;
+            out["ids"] = ids;                   out["scores"] = scores;
+            out["timestamp"] = timestamp;       out["importance"] = importance;
+            out["type"] = type;                 out["recall_count"] = recall_count;
+            out["last_recalled_at"] = last_recalled_at;
+            out["source"] = source;             out["content"] = content;
+            out["tags_json"] = tags_json;       out["namespace_id"] = namespace_id;
+            out["entity_id"] = entity_id;       out["attributes"] = attributes;
+            out["links"] = links;
+            return out;
+        }, py::arg("q"), py::arg("k") = 5,
+           py::arg("filter") = nullptr, py::arg("scoring") = nullptr,
+           py::arg("modality") = "text",
+           "search() returning a dict of parallel columns (ids, scores, metadata "
+           "fields as ndarrays / lists) instead of SearchResult objects.")
+
+        .def("batch_search", [](feather::DB& db,
+                                 py::array_t<float, py::array::c_style | py::array::forcecast> queries,
+                                 size_t k,
+                                 const feather::SearchFilter* filter,
+                                 const feather::ScoringConfig* scoring,
+                                 const std::string& modality) {
+            auto buf = queries.request();
+            if (buf.ndim != 2)
+                throw std::runtime_error("batch_search: queries must be a 2D array (N x dim)");
+            const float* ptr = static_cast<const float*>(buf.ptr);
+            size_t n = static_cast<size_t>(buf.shape[0]);
+            size_t dim = static_cast<size_t>(buf.shape[1]);
+            py::gil_scoped_release rel;
+            return db.batch_search(ptr, n, dim, k, filter, scoring, modality);
+        }, py::arg("queries"), py::arg("k") = 5,
+           py::arg("filter") = nullptr, py::arg("scoring") = nullptr,
+           py::arg("modality") = "text",
+           "search() for every row of an (N, dim) array under one lock; "
+           "returns one result list per row.")
+
         // -- Graph --
         .def("link", &feather::DB::link,
              py::arg("from_id"), py::arg("to_id"),
              py::arg("rel_type") = "related_to",
              py::arg("weight") = 1.0f)
 
+        .def("link_many", [](feather::DB& db,
+                              py::array_t<uint64_t, py::array::c_style | py::array::forcecast> from_ids,
+                              py::array_t<uint64_t, py::array::c_style | py::array::forcecast> to_ids,
+                              const std::string& rel_type,
+                              py::object weights) {
+            auto fb = from_ids.request();
+            auto tb = to_ids.request();
+            if (fb.size != tb.size)
+                throw std::runtime_error("link_many: len(from_ids) != len(to_ids)");
+            const uint64_t* fp = static_cast<const uint64_t*>(fb.ptr);
+            const uint64_t* tp = static_cast<const uint64_t*>(tb.ptr);
+            std::vector<uint64_t> fv(fp, fp + fb.size);
+            std::vector<uint64_t> tv(tp, tp + tb.size);
+            std::vector<float> wv;
+            if (py::isinstance<py::float_>(weights) || py::isinstance<py::int_>(weights)) {
+                wv.assign(fv.size(), weights.cast<float>());
+            } else if (!weights.is_none()) {
+                auto wa = py::array_t<float, py::array::c_style | py::array::forcecast>::ensure(weights);
+                if (!wa)
+                    throw std::runtime_error("link_many: weights must be a float or an array of floats");
+                auto wb = wa.request();
+                const float* wp = static_cast<const float*>(wb.ptr);
+                wv.assign(wp, wp + wb.size);
+            }
+            py::gil_scoped_release rel;
+            return db.link_many(fv, tv, rel_type, wv);
+        }, py::arg("from_ids"), py::arg("to_ids"),
+           py::arg("rel_type") = "related_to",
+           py::arg("weights") = py::none(),
+           "Bulk link(): N edges in one call (from_ids/to_ids: int arrays, weights: "
+           "None, a float, or an array). Returns the number of edges created.")
+
         .def("get_edges",    &feather::DB::get_edges,    py::arg("id"))
         .def("get_incoming", &feather::DB::get_incoming, py::arg("id"))
 
@@ -201,6 +335,7 @@ PYBIND11_MODULE(core, m) {
              py::arg("threshold")  = 0.80f,
              py::arg("rel_type")   = "related_to",
              py::arg("candidates") = 15,
+             py::call_guard<py::gil_scoped_release>(),
              "Auto-create edges between records whose vector similarity exceeds threshold.")
 
         .def("context_chain", [](feather::DB& db, py::array_t<float> q,
@@ -208,6 +343,7 @@ PYBIND11_MODULE(core, m) {
             auto buf = q.request();
             const float* ptr = static_cast<const float*>(buf.ptr);
             std::vector<float> query(ptr, ptr + buf.size);
+            py::gil_scoped_release rel;
             return db.context_chain(query, k, hops, modality);
         }, py::arg("q"), py::arg("k") = 5, py::arg("hops") = 2,
            py::arg("modality") = "text",
@@ -216,6 +352,7 @@ PYBIND11_MODULE(core, m) {
         .def("export_graph_json", &feather::DB::export_graph_json,
              py::arg("namespace_filter") = "",
              py::arg("entity_filter")    = "",
+             py::call_guard<py::gil_scoped_release>(),
              "Export graph as D3/Cytoscape-compatible JSON string.")
 
         // -- Metadata --
@@ -223,6 +360,30 @@ PYBIND11_MODULE(core, m) {
         .def("get_metadata",      &feather::DB::get_metadata,      py::arg("id"))
         .def("update_metadata",   &feather::DB::update_metadata,   py::arg("id"), py::arg("meta"))
         .def("update_importance", &feather::DB::update_importance, py::arg("id"), py::arg("importance"))
+        .def("touch_many", [](feather::DB& db,
+                               py::array_t<uint64_t, py::array::c_style | py::array::forcecast> ids) {
+            auto buf = ids.request();
+            const uint64_t* ptr = static_cast<const uint64_t*>(buf.ptr);
+            std::vector<uint64_t> iv(ptr, ptr + buf.size);
+            py::gil_scoped_release rel;
+            db.touch_many(iv);
+        }, py::arg("ids"),
+           "Bulk touch(): an id listed k times is touched k times.")
+        .def("update_importance_many", [](feather::DB& db,
+                                           py::array_t<uint64_t, py::array::c_style | py::array::forcecast> ids,
+                                           py::array_t<float, py::array::c_style | py::array::forcecast> importances) {
+            auto ib = ids.request();
+            auto wb = importances.request();
+            if (ib.size != wb.size)
+                throw std::runtime_error("update_importance_many: len(ids) != len(importances)");
+            const uint64_t* ip = static_cast<const uint64_t*>(ib.ptr);
+            const float* wp = static_cast<const float*>(wb.ptr);
+            std::vector<uint64_t> iv(ip, ip + ib.size);
+            std::vector<float> wv(wp, wp + wb.size);
+            py::gil_scoped_release rel;
+            db.update_importance_many(iv, wv);
+        }, py::arg("ids"), py::arg("importances"),
+           "Bulk update_importance() for N records in one call.")
         .def("get_vector", [](feather::DB& db, uint64_t id, const std::string& modality) {
             auto vec = db.get_vector(id, modality);
             return py::array_t<float>(vec.size(), vec.data());
@@ -249,6 +410,7 @@ PYBIND11_MODULE(core, m) {
         // -- BM25 keyword search --
         .def("keyword_search", [](feather::DB& db, const std::string& query, size_t k,
                                    feather::SearchFilter* filter) {
+            py::gil_scoped_release rel;
             return db.keyword_search(query, k, filter);
         }, py::arg("query"), py::arg("k") = 10, py::arg("filter") = nullptr,
            "BM25 keyword search over content field. Returns list of SearchResult.")
@@ -263,6 +425,7 @@ PYBIND11_MODULE(core, m) {
             py::buffer_info buf = q.request();
             std::vector<float> query_vec(static_cast<float*>(buf.ptr),
                                          static_cast<float*>(buf.ptr) + buf.size);
+            py::gil_scoped_release rel;
             return db.hybrid_search(query_vec, query, k, rrf_k, filter, scoring, modality);
         }, py::arg("vec"), py::arg("query"), py::arg("k") = 10,
            py::arg("rrf_k") = 60, py::arg("filter") = nullptr,
@@ -271,6 +434,7 @@ PYBIND11_MODULE(core, m) {
 
         // -- Compact (rebuild HNSW without dead records) --
         .def("compact", &feather::DB::compact,
+             py::call_guard<py::gil_scoped_release>(),
              "Rebuild HNSW indices removing dead (forgotten/_deleted) records and "
              "orphaned vectors. Returns count of records removed.")
         .def("set_auto_compact", &feather::DB::set_auto_compact, py::arg("ratio"),
@@ -300,12 +464,15 @@ PYBIND11_MODULE(core, m) {
         .def("forget",         &feather::DB::forget,         py::arg("id"),
              "Soft-delete: remove from search + blank content. Graph shell preserved.")
         .def("purge",          &feather::DB::purge,          py::arg("namespace_id"),
+             py::call_guard<py::gil_scoped_release>(),
              "Hard-delete all nodes in namespace_id. Returns count of removed nodes.")
         .def("forget_expired", &feather::DB::forget_expired,
+             py::call_guard<py::gil_scoped_release>(),
              "Soft-delete all nodes where ttl>0 and now > timestamp+ttl. Returns count.")
 
         // -- Persistence & info --
-        .def("save", &feather::DB::save)
+        .def("save", &feather::DB::save,
+             py::call_guard<py::gil_scoped_release>())   // full file write
         .def("size", &feather::DB::size)
         .def("dim",  &feather::DB::dim, py::arg("modality") = "text")
 
@@ -11,36 +11,38 @@ Graph edges:
   - references: similar ads (auto_link)
 """
 
-import sys, json, time, math, hashlib, re
+import sys, json, time, math, hashlib, re, datetime, csv, itertools
 import numpy as np
 
 sys.path.insert(0, '.')
 import feather_db
-from feather_db import DB, Metadata, ContextType, FilterBuilder, RelType, visualize, export_graph
+from feather_db import (DB, Metadata, ContextType, FilterBuilder, RelType, visualize, export_graph,
+                        auto_link_from_matrix)
 
 # ─── Parse CSV ───────────────────────────────────────────────────────────────
 def parse_csv(path):
-    with open(path, 'rb') as f:
-        raw = f.read()
-    lines = raw.split(b'\n')
-    header_cols, data_start = [], 0
-    for i, line in enumerate(lines):
-        if b'\t' in line:
-            data_start = i
-            break
-        col = line.decode('utf-8', errors='replace').strip()
-        if col:
-            header_cols.append(col)
-    all_cols = ['row_num'] + header_cols
-    rows = []
-    for line in lines[data_start:]:
-        decoded = line.decode('utf-8', errors='replace').strip()
-        if not decoded:
-            continue
-        parts = decoded.split('\t')
-        if len(parts) == len(all_cols):
-            rows.append(dict(zip(all_cols, parts)))
-    return rows
+    """Stream row dicts from the export: one column name per line, then TSV rows.
+
+    Reads line by line — the file is never held in memory as a whole.
+    """
+    with open(path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        header_cols = []
+        line = f.readline()
+        while line and '\t' not in line:
+            col = line.strip()
+            if col:
+                header_cols.append(col)
+            line = f.readline()
+        all_cols = ['row_num'] + header_cols
+        reader = csv.reader(itertools.chain([line], f), delimiter='\t',
+                            quoting=csv.QUOTE_NONE)
+        for parts in reader:
+            if not parts:
+                continue
+            parts[0] = parts[0].lstrip()
+            parts[-1] = parts[-1].rstrip()
+            if len(parts) == len(all_cols):
+                yield dict(zip(all_cols, parts))
 
 NULL_SYM = 'ᴺᵁᴸᴸ'
 
@@ -71,6 +73,9 @@ def safe_int(v, default=0):
 
 DIM = 128
 
+# Importance is log-scaled against the largest single-ad spend in the dataset
+LOG_DEN = math.log1p(6_131_954)
+
 PRODUCT_MAP = {'CC': 0, 'FD': 1, 'MF': 2, 'SB': 3, 'Bonds': 4, 'Bond': 4,
                'RD': 5, 'AppPromotion': 6, 'RET': 7, 'Ret': 7, 'SM': 8}
 OBJ_MAP = {'Purchase': 0, 'Installs': 1, 'Registration': 2,
@@ -79,15 +84,10 @@ GEO_MAP = {'Metro': 0, 'South': 1, 'TamilNadu': 2, 'KL': 3,
            'ROI': 4, 'India': 5, 'INT': 6}
 CREATIVE_MAP = {'Static': 0, 'Video': 1, 'Carousel': 2, 'Reel': 3, 'DSA': 4}
 
-def one_hot_16(val, mapping):
-    vec = np.zeros(16, dtype=np.float32)
-    idx = mapping.get(val, 15)  # 15 = unknown
-    vec[idx % 16] = 1.0
-    return vec
-
-def roas_tier_vec(roas):
+# The *_tier_vec helpers write into a zeroed 16-float view of the output
+# embedding instead of allocating their own arrays.
+def roas_tier_vec(roas, vec):
     """Smooth encoding: 0=zero, 1=low(<1), 2=mid(1-5), 3=high(5-20), 4=very_high(>20)"""
-    vec = np.zeros(16, dtype=np.float32)
     if roas <= 0:        vec[0] = 1.0
     elif roas < 1:       vec[1] = 1.0; vec[2] = roas
     elif roas < 5:       vec[2] = 1.0; vec[3] = roas / 5.0
@@ -95,8 +95,7 @@ def roas_tier_vec(roas):
     else:                vec[4] = 1.0; vec[5] = min(roas / 100.0, 1.0)
     return vec
 
-def spend_tier_vec(spend):
-    vec = np.zeros(16, dtype=np.float32)
+def spend_tier_vec(spend, vec):
     if spend <= 0:           vec[0] = 1.0
     elif spend < 1000:       vec[1] = 1.0; vec[2] = spend / 1000.0
     elif spend < 10000:      vec[2] = 1.0; vec[3] = spend / 10000.0
@@ -105,8 +104,7 @@ def spend_tier_vec(spend):
     else:                    vec[5] = 1.0
     return vec
 
-def ctr_tier_vec(ctr):
-    vec = np.zeros(16, dtype=np.float32)
+def ctr_tier_vec(ctr, vec):
     if ctr <= 0:       vec[0] = 1.0
     elif ctr < 0.5:    vec[1] = 1.0; vec[2] = ctr / 0.5
     elif ctr < 1.5:    vec[2] = 1.0; vec[3] = ctr / 1.5
@@ -114,11 +112,16 @@ def ctr_tier_vec(ctr):
     else:              vec[4] = 1.0
     return vec
 
+_noise_cache = {}   # campaign_id -> noise vector (one RNG per campaign, not per ad)
+
 def campaign_noise(campaign_id):
     """Deterministic noise seeded by campaign_id — keeps same-campaign ads nearby."""
-    h = int(hashlib.md5(campaign_id.encode()).hexdigest(), 16)
-    rng = np.random.default_rng(h % (2**32))
-    return rng.random(16).astype(np.float32) * 0.15
+    vec = _noise_cache.get(campaign_id)
+    if vec is None:
+        h = int(hashlib.md5(campaign_id.encode()).hexdigest(), 16)
+        rng = np.random.default_rng(h % (2**32))
+        vec = _noise_cache[campaign_id] = rng.random(16).astype(np.float32) * 0.15
+    return vec
 
 def extract_field(name, mapping):
     """Extract first matching key from a naming-convention string."""
@@ -137,18 +140,29 @@ def make_embedding(row):
     ctr       = safe_float(row['ctr'])
     cid       = row['campaign_id']
 
-    vec = np.concatenate([
-        one_hot_16(product, PRODUCT_MAP),    # 0-15
-        one_hot_16(objective, OBJ_MAP),      # 16-31
-        one_hot_16(geo, GEO_MAP),            # 32-47
-        one_hot_16(creative, CREATIVE_MAP),  # 48-63
-        roas_tier_vec(roas),                 # 64-79
-        spend_tier_vec(spend),               # 80-95
-        ctr_tier_vec(ctr),                   # 96-111
-        campaign_noise(cid),                 # 112-127
-    ])
+    # One-hot slots: mapping values are all < 15, 15 = unknown
+    vec = np.zeros(DIM, dtype=np.float32)
+    vec[PRODUCT_MAP.get(product, 15)]        = 1.0  # 0-15
+    vec[16 + OBJ_MAP.get(objective, 15)]     = 1.0  # 16-31
+    vec[32 + GEO_MAP.get(geo, 15)]           = 1.0  # 32-47
+    vec[48 + CREATIVE_MAP.get(creative, 15)] = 1.0  # 48-63
+    roas_tier_vec(roas, vec[64:80])
+    spend_tier_vec(spend, vec[80:96])
+    ctr_tier_vec(ctr, vec[96:112])
+    vec[112:128] = campaign_noise(cid)
     norm = np.linalg.norm(vec)
-    return (vec / norm) if norm > 0 else vec
+    if norm > 0:
+        vec /= norm
+    return vec
+
+
+def top_k_idx(values, k):
+    """Indices of the k largest values, descending — O(N + k log k)."""
+    k = min(k, len(values))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    idx = np.argpartition(-values, k - 1)[:k]
+    return idx[np.argsort(-values[idx], kind='stable')]
 
 
 # ─── Parse creative type from URL ────────────────────────────────────────────
@@ -178,7 +192,7 @@ print("=" * 65)
 CSV_PATH = "real_data/meta_performance_data.csv"
 DB_PATH  = "/tmp/real_meta_ads.feather"
 
-rows = parse_csv(CSV_PATH)
+rows = list(parse_csv(CSV_PATH))
 print(f"\n[1] Loaded {len(rows)} records from {CSV_PATH}")
 
 db = DB.open(DB_PATH, dim=DIM)
@@ -206,9 +220,28 @@ CAMP_BASE  = N_ADS + N_ADSETS + 1
 
 print(f"   Ads: {N_ADS}   Ad Sets: {N_ADSETS}   Campaigns: {N_CAMPAIGNS}")
 
+# ─── Column arrays ────────────────────────────────────────────────────────────
+spend_arr = np.array([safe_float(r['total_spend']) for r in rows], dtype=np.float64)
+roas_arr  = np.array([safe_float(r['roas'])        for r in rows], dtype=np.float64)
+
+# Categorical columns as codes into these key lists (last entry = no match)
+OBJ_KEYS     = list(OBJ_MAP) + ['unknown']
+PRODUCT_KEYS = list(PRODUCT_MAP) + ['other']
+obj_idx     = np.array([OBJ_KEYS.index(extract_field(r['campaign_name'], OBJ_MAP)) for r in rows])
+product_idx = np.array([PRODUCT_KEYS.index(product_line(r['campaign_name'])) for r in rows])
+
+# Embedding cache: row i is the vector of ad i+1; campaign / ad set vectors
+# are averages over these rows.
+EMB = np.stack([make_embedding(r) for r in rows]).astype(np.float32)
+node_ids, node_vecs = [], []   # every inserted node, for matrix auto-link
+
+# Importance scaled by spend (log-normalised, max ~6M)
+imp_arr = np.minimum(0.5 + 0.5 * np.log1p(spend_arr) / LOG_DEN, 1.0).astype(np.float32)
+
 
 # ─── Insert Campaign nodes ────────────────────────────────────────────────────
 print(f"\n[2] Inserting {N_CAMPAIGNS} campaign nodes...")
+NOW = int(time.time())   # default timestamp for nodes without their own
 for cid, seq in unique_campaigns.items():
     feather_id = CAMP_BASE + seq - 1
     cname = None
@@ -218,7 +251,7 @@ for cid, seq in unique_campaigns.items():
             break
 
     m = Metadata()
-    m.timestamp  = int(time.time())
+    m.timestamp  = NOW
     m.type       = ContextType.FACT
     m.source     = "meta_ads_api"
     m.content    = cname or cid
@@ -230,11 +263,11 @@ for cid, seq in unique_campaigns.items():
     m.set_attribute("product_line", product_line(cname or ''))
 
     # Campaign vector: avg of its ads' embeddings
-    camp_rows = [r for r in rows if r['campaign_id'] == cid]
-    vecs = [make_embedding(r) for r in camp_rows]
-    avg_vec = np.mean(vecs, axis=0).astype(np.float32)
+    camp_idx = [i for i, r in enumerate(rows) if r['campaign_id'] == cid]
+    avg_vec = EMB[camp_idx].mean(axis=0)
     avg_vec /= (np.linalg.norm(avg_vec) or 1.0)
     db.add(id=feather_id, vec=avg_vec, meta=m)
+    node_ids.append(feather_id); node_vecs.append(avg_vec)
 
 
 # ─── Insert Ad Set nodes ──────────────────────────────────────────────────────
@@ -250,7 +283,7 @@ for asid, seq in unique_adsets.items():
             break
 
     m = Metadata()
-    m.timestamp  = int(time.time())
+    m.timestamp  = NOW
     m.type       = ContextType.FACT
     m.source     = "meta_ads_api"
     m.content    = aname or asid
@@ -262,11 +295,11 @@ for asid, seq in unique_adsets.items():
     if cid:
         m.set_attribute("campaign_id", cid)
 
-    adset_rows = [r for r in rows if r['adset_id'] == asid]
-    vecs = [make_embedding(r) for r in adset_rows]
-    avg_vec = np.mean(vecs, axis=0).astype(np.float32)
+    adset_idx = [i for i, r in enumerate(rows) if r['adset_id'] == asid]
+    avg_vec = EMB[adset_idx].mean(axis=0)
     avg_vec /= (np.linalg.norm(avg_vec) or 1.0)
     db.add(id=feather_id, vec=avg_vec, meta=m)
+    node_ids.append(feather_id); node_vecs.append(avg_vec)
 
 
 # ─── Insert Ad nodes ──────────────────────────────────────────────────────────
@@ -289,16 +322,12 @@ for i, r in enumerate(rows):
     hook_rate   = safe_float(r['hook_rate'])
     hold_rate   = safe_float(r['hold_rate'])
 
-    # Importance scaled by spend (log-normalised, max ~6M)
-    imp = min(0.5 + 0.5 * math.log1p(spend) / math.log1p(6_131_954), 1.0)
-
     # Parse ad_created_time
     try:
-        import datetime
         dt = datetime.datetime.strptime(r['ad_created_time'], '%Y-%m-%d %H:%M:%S')
         ts = int(dt.timestamp())
     except:
-        ts = int(time.time())
+        ts = NOW
 
     # Classify context type
     if roas > 5:
@@ -313,29 +342,30 @@ for i, r in enumerate(rows):
     m.type       = ctype
     m.source     = "meta_ads_api"
     m.content    = r['ad_name']
-    m.importance = imp
+    m.importance = float(imp_arr[i])
     m.namespace_id = "hawky_meta"
     m.entity_id    = r['ad_id']        # Meta's ad ID
-    m.set_attribute("record_type",   "ad")
-    m.set_attribute("ad_name",       r['ad_name'])
-    m.set_attribute("adset_id",      r['adset_id'])
-    m.set_attribute("campaign_id",   r['campaign_id'])
-    m.set_attribute("creative_type", creative_type(r['url']))
-    m.set_attribute("product_line",  product_line(r['campaign_name']))
-    m.set_attribute("roas",          str(round(roas, 4)))
-    m.set_attribute("spend",         str(round(spend, 2)))
-    m.set_attribute("ctr",           str(round(ctr, 4)))
-    m.set_attribute("cpm",           str(round(cpm, 2)))
-    m.set_attribute("cpc",           str(round(cpc, 2)))
-    m.set_attribute("impressions",   str(impressions))
-    m.set_attribute("clicks",        str(clicks))
-    m.set_attribute("installs",      str(installs))
-    m.set_attribute("hook_rate",     str(round(hook_rate, 4)))
-    m.set_attribute("hold_rate",     str(round(hold_rate, 4)))
-    m.set_attribute("url",           r['url'][:200])
-
-    vec = make_embedding(r)
-    db.add(id=feather_id, vec=vec, meta=m)
+    m.set_attributes({
+        "record_type":   "ad",
+        "ad_name":       r['ad_name'],
+        "adset_id":      r['adset_id'],
+        "campaign_id":   r['campaign_id'],
+        "creative_type": creative_type(r['url']),
+        "product_line":  product_line(r['campaign_name']),
+        "roas":          f"{roas:.4f}",
+        "spend":         f"{spend:.2f}",
+        "ctr":           f"{ctr:.4f}",
+        "cpm":           f"{cpm:.2f}",
+        "cpc":           f"{cpc:.2f}",
+        "impressions":   str(impressions),
+        "clicks":        str(clicks),
+        "installs":      str(installs),
+        "hook_rate":     f"{hook_rate:.4f}",
+        "hold_rate":     f"{hold_rate:.4f}",
+        "url":           r['url'][:200],
+    })
+
+    db.add(id=feather_id, vec=EMB[i], meta=m)
 
     # Track for edge creation
     as_fid = ADSET_BASE + unique_adsets[r['adset_id']] - 1
@@ -349,23 +379,17 @@ print(f"   Inserted in {time.time()-t0:.2f}s")
 # ─── Build hierarchy edges ────────────────────────────────────────────────────
 print("\n[5] Building hierarchy edges (part_of)...")
 
+# Per-row feather ids: the ad itself, its ad set and its campaign
+ad_fids    = np.arange(1, N_ADS + 1, dtype=np.int64)
+adset_fids = ADSET_BASE + np.array([unique_adsets[r['adset_id']] - 1 for r in rows], dtype=np.int64)
+camp_fids  = CAMP_BASE  + np.array([unique_campaigns[r['campaign_id']] - 1 for r in rows], dtype=np.int64)
+
 # Ad → Ad Set
-for r in rows:
-    ad_fid    = int(r['row_num'])
-    adset_fid = ADSET_BASE + unique_adsets[r['adset_id']] - 1
-    db.link(ad_fid, adset_fid, RelType.PART_OF, weight=1.0)
+db.link_many(ad_fids, adset_fids, RelType.PART_OF)
 
-# Ad Set → Campaign
-for asid, seq in unique_adsets.items():
-    adset_fid = ADSET_BASE + seq - 1
-    cid = None
-    for r in rows:
-        if r['adset_id'] == asid:
-            cid = r['campaign_id']
-            break
-    if cid:
-        camp_fid = CAMP_BASE + unique_campaigns[cid] - 1
-        db.link(adset_fid, camp_fid, RelType.PART_OF, weight=1.0)
+# Ad Set → Campaign (campaign of the ad set's first row)
+first_row = np.unique(adset_fids, return_index=True)[1]
+db.link_many(adset_fids[first_row], camp_fids[first_row], RelType.PART_OF)
 
 print(f"   {N_ADS} ad→adset + {N_ADSETS} adset→campaign edges")
 
@@ -374,21 +398,14 @@ print(f"   {N_ADS} ad→adset + {N_ADSETS} adset→campaign edges")
 print("\n[6] Building performance signal edges...")
 
 # Find top performers (ROAS > 5) and link them to their campaigns with caused_by
-caused_edges = 0
-supports_edges = 0
-for r in rows:
-    roas = safe_float(r['roas'])
-    ad_fid   = int(r['row_num'])
-    camp_fid = CAMP_BASE + unique_campaigns[r['campaign_id']] - 1
-
-    if roas > 5:
-        # top performer causes campaign success signal
-        db.link(camp_fid, ad_fid, RelType.CAUSED_BY, weight=min(roas/50.0, 1.0))
-        caused_edges += 1
-    elif roas > 1:
-        # decent performer supports campaign
-        db.link(camp_fid, ad_fid, RelType.SUPPORTS, weight=roas/5.0)
-        supports_edges += 1
+# top performer causes campaign success signal
+caused = roas_arr > 5
+caused_edges = db.link_many(camp_fids[caused], ad_fids[caused], RelType.CAUSED_BY,
+                            np.minimum(roas_arr[caused] / 50.0, 1.0))
+# decent performer supports campaign
+supports = (roas_arr > 1) & ~caused
+supports_edges = db.link_many(camp_fids[supports], ad_fids[supports], RelType.SUPPORTS,
+                              roas_arr[supports] / 5.0)
 
 print(f"   {caused_edges} caused_by (ROAS>5)   {supports_edges} supports (ROAS 1-5)")
 
@@ -396,38 +413,42 @@ print(f"   {caused_edges} caused_by (ROAS>5)   {supports_edges} supports (ROAS 1
 # ─── Cross-product line edges (references) ────────────────────────────────────
 print("\n[7] Cross-product reference edges (same objective, different product)...")
 # Group by objective, link top ads across product lines
-objective_groups = {}
-for r in rows:
-    obj = extract_field(r['campaign_name'], OBJ_MAP)
-    roas = safe_float(r['roas'])
-    if roas > 3:
-        objective_groups.setdefault(obj, []).append((int(r['row_num']), roas, product_line(r['campaign_name'])))
-
-ref_edges = 0
-for obj, ads in objective_groups.items():
-    # Sort by ROAS desc, link top 3 across different product lines
-    ads.sort(key=lambda x: -x[1])
+mask = roas_arr > 3
+ref_src, ref_dst = [], []
+for obj_id in dict.fromkeys(obj_idx[mask].tolist()):   # first-seen order
+    # Sort by ROAS desc, link the top ad of up to 4 different product lines
+    rows_i = np.flatnonzero(mask & (obj_idx == obj_id))
+    order = rows_i[np.argsort(-roas_arr[rows_i], kind='stable')]
     seen_products = set()
     top = []
-    for fid, roas, pl in ads:
+    for i in order:
+        pl = product_idx[i]
         if pl not in seen_products:
-            top.append((fid, roas, pl))
+            top.append(int(i) + 1)
             seen_products.add(pl)
-        if len(top) >= 4:
-            break
-    for i in range(len(top)):
-        for j in range(i+1, len(top)):
-            db.link(top[i][0], top[j][0], RelType.REFERENCES, weight=0.6)
-            ref_edges += 1
+            if len(top) == 4:
+                break
+    for a in range(len(top)):
+        for b in range(a+1, len(top)):
+            ref_src.append(top[a])
+            ref_dst.append(top[b])
+ref_edges = db.link_many(np.array(ref_src, dtype=np.int64), np.array(ref_dst, dtype=np.int64),
+                         RelType.REFERENCES, 0.6)
 
 print(f"   {ref_edges} cross-product reference edges")
 
 
 # ─── Auto-link by vector similarity ──────────────────────────────────────────
-print("\n[8] Auto-linking by vector similarity (threshold=0.88)...")
+print("\n[8] Auto-linking by vector similarity (cosine >= 0.93, top-8)...")
 t0 = time.time()
-n_auto = db.auto_link(modality="text", threshold=0.88, rel_type=RelType.RELATED_TO, candidates=8)
-print(f"   {n_auto} similarity edges created in {time.time()-t0:.0f}ms")
+# All node vectors are already in memory: one blocked GEMM + a single
+# link_many call instead of a per-node HNSW query. On unit vectors cosine 0.93
+# matches db.auto_link's 1/(1+L2²) >= 0.88 cut-off.
+all_ids  = np.concatenate([np.array(node_ids, dtype=np.int64), np.arange(1, N_ADS + 1)])
+all_vecs = np.vstack([np.array(node_vecs, dtype=np.float32), EMB])
+n_auto = auto_link_from_matrix(db, all_ids, all_vecs, threshold=0.93,
+                               rel_type=RelType.RELATED_TO, k=8)
+print(f"   {n_auto} similarity edges created in {(time.time()-t0)*1000:.0f}ms")
 
 
 # ─── Queries ──────────────────────────────────────────────────────────────────
@@ -437,19 +458,17 @@ print("=" * 65)
 
 # Q1: Top performing ads by ROAS
 print("\nQ1 — Top 10 ads by ROAS:")
-top_roas = sorted(
-    [(int(r['row_num']), safe_float(r['roas']), r['ad_name'], r['campaign_name'],
-      creative_type(r['url']), safe_float(r['total_spend']))
-     for r in rows if safe_float(r['roas']) > 0],
-    key=lambda x: -x[1]
-)[:10]
+pos = np.flatnonzero(roas_arr > 0)
+top_roas = [(int(rows[i]['row_num']), roas_arr[i], rows[i]['ad_name'], rows[i]['campaign_name'],
+             creative_type(rows[i]['url']), spend_arr[i])
+            for i in pos[top_k_idx(roas_arr[pos], 10)]]
 for fid, roas, name, camp, ctype, spend in top_roas:
     print(f"  id:{fid:<4} roas={roas:>8.2f}  spend={spend:>10,.0f}  type={ctype:<5}  {name[:45]}")
 
 # Q2: Filter video ads with ROAS > 2
 print("\nQ2 — Video ads with ROAS > 2:")
 f = FilterBuilder().namespace("hawky_meta").attribute("creative_type", "video").attribute("record_type", "ad")
-q_vec = make_embedding(rows[0])
+q_vec = EMB[0]
 results = db.search(q_vec, k=50, filter=f.build())
 video_high = [(r.id, safe_float(r.metadata.get_attribute("roas","0")), r.metadata.content)
               for r in results if safe_float(r.metadata.get_attribute("roas","0")) > 2]
@@ -473,7 +492,7 @@ for pl, vals in sorted(pl_roas.items(), key=lambda x: -sum(x[1])/len(x[1])):
 # Q4: Context chain from a high-ROAS ad
 print("\nQ4 — Context chain from top ROAS ad (2 hops):")
 top_ad_id = top_roas[0][0]
-top_vec = make_embedding(rows[top_ad_id - 1])
+top_vec = EMB[top_ad_id - 1]
 chain = db.context_chain(top_vec, k=5, hops=2, modality="text")
 print(f"   Subgraph: {len(chain.nodes)} nodes, {len(chain.edges)} edges")
 print("   Top nodes:")
@@ -485,30 +504,27 @@ for n in chain.nodes[:8]:
 
 # Q5: High-spend low-ROAS (inefficient ads to review)
 print("\nQ5 — High spend, low ROAS (potential waste):")
-waste = sorted(
-    [(int(r['row_num']), safe_float(r['roas']), safe_float(r['total_spend']), r['ad_name'])
-     for r in rows if safe_float(r['total_spend']) > 10000 and safe_float(r['roas']) < 1],
-    key=lambda x: -x[2]
-)[:8]
+pos = np.flatnonzero((spend_arr > 10000) & (roas_arr < 1))
+waste = [(int(rows[i]['row_num']), roas_arr[i], spend_arr[i], rows[i]['ad_name'])
+         for i in pos[top_k_idx(spend_arr[pos], 8)]]
 for fid, roas, spend, name in waste:
     print(f"  id:{fid:<4} spend={spend:>10,.0f}  roas={roas:.4f}  {name[:50]}")
 
 # Q6: Campaign spend + ROAS roll-up
 print("\nQ6 — Campaign roll-up (spend, ROAS, # ads):")
-camp_stats = {}
-for r in rows:
-    cname = r['campaign_name']
-    roas  = safe_float(r['roas'])
-    spend = safe_float(r['total_spend'])
-    camp_stats.setdefault(cname, {'spend': 0, 'roas_vals': [], 'n': 0})
-    camp_stats[cname]['spend'] += spend
-    camp_stats[cname]['n'] += 1
-    if roas > 0:
-        camp_stats[cname]['roas_vals'].append(roas)
-
-for cname, s in sorted(camp_stats.items(), key=lambda x: -x[1]['spend'])[:10]:
-    avg_r = sum(s['roas_vals'])/len(s['roas_vals']) if s['roas_vals'] else 0
-    print(f"  spend={s['spend']:>10,.0f}  avg_roas={avg_r:>7.2f}  n={s['n']:<3}  {cname[:60]}")
+camp_names = {}   # campaign_name -> group index (first-seen order)
+camp_code  = np.array([camp_names.setdefault(r['campaign_name'], len(camp_names)) for r in rows])
+n_groups   = len(camp_names)
+pos_roas   = roas_arr > 0
+camp_spend = np.bincount(camp_code, weights=spend_arr, minlength=n_groups)
+camp_n     = np.bincount(camp_code, minlength=n_groups)
+roas_sum   = np.bincount(camp_code[pos_roas], weights=roas_arr[pos_roas], minlength=n_groups)
+roas_cnt   = np.bincount(camp_code[pos_roas], minlength=n_groups)
+names      = list(camp_names)
+
+for g in top_k_idx(camp_spend, 10):
+    avg_r = roas_sum[g] / roas_cnt[g] if roas_cnt[g] else 0
+    print(f"  spend={camp_spend[g]:>10,.0f}  avg_roas={avg_r:>7.2f}  n={camp_n[g]:<3}  {names[g][:60]}")
 
 
 # ─── Graph export & visualization ────────────────────────────────────────────
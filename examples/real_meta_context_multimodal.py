@@ -20,7 +20,8 @@ Demonstrates three advanced features on real Meta Ads data:
     Compare search results: raw similarity vs time-weighted
 """
 
-import sys, json, time, math, hashlib, re, urllib.request, struct
+import sys, os, json, time, math, hashlib, re, urllib.request, struct, csv, itertools, functools
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 sys.path.insert(0, '.')
 
@@ -33,30 +34,51 @@ DIM     = 128
 
 # ─── Shared helpers ──────────────────────────────────────────────────────────
 NULL_SYM = 'ᴺᵁᴸᴸ'
+TOKEN_RE = re.compile(r'[,/\s]+')   # entity value → tokens
+DIGIT_RE = re.compile(r'\d')
 
 def safe_float(v, d=0.0):
     try: return float(v) if v not in (NULL_SYM,'','None') else d
     except: return d
 
+# 32-bit seeds for the "stable hash noise" dims. xxhash is optional; the md5
+# fallback takes the low 32 bits straight from the digest bytes, which equals
+# the old int(hexdigest, 16) % 2**32 without the hex round-trip.
+try:
+    import xxhash
+    HASH_NAME = 'xxh64'
+    def hash32(data):
+        return xxhash.xxh64_intdigest(data) & 0xFFFFFFFF
+except ImportError:
+    HASH_NAME = 'md5'
+    def hash32(data):
+        return int.from_bytes(hashlib.md5(data).digest()[-4:], 'big')
+
 def parse_csv(path):
-    with open(path, 'rb') as f: raw = f.read()
-    lines = raw.split(b'\n')
-    header_cols, data_start = [], 0
-    for i, line in enumerate(lines):
-        if b'\t' in line: data_start = i; break
-        col = line.decode('utf-8', errors='replace').strip()
-        if col: header_cols.append(col)
-    all_cols = ['row_num'] + header_cols
-    rows = []
-    for line in lines[data_start:]:
-        decoded = line.decode('utf-8', errors='replace').strip()
-        if not decoded: continue
-        parts = decoded.split('\t')
-        if len(parts) == len(all_cols):
-            rows.append(dict(zip(all_cols, parts)))
-    return rows
-
-rows = parse_csv('real_data/meta_performance_data.csv')
+    """Stream row dicts from the export: one column name per line, then TSV rows.
+
+    Reads line by line — the file is never held in memory as a whole.
+    """
+    with open(path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        header_cols = []
+        line = f.readline()
+        while line and '\t' not in line:
+            col = line.strip()
+            if col:
+                header_cols.append(col)
+            line = f.readline()
+        all_cols = ['row_num'] + header_cols
+        reader = csv.reader(itertools.chain([line], f), delimiter='\t',
+                            quoting=csv.QUOTE_NONE)
+        for parts in reader:
+            if not parts:
+                continue
+            parts[0] = parts[0].lstrip()
+            parts[-1] = parts[-1].rstrip()
+            if len(parts) == len(all_cols):
+                yield dict(zip(all_cols, parts))
+
+rows = list(parse_csv('real_data/meta_performance_data.csv'))
 
 # ID layout matches real_meta_ads_ingest.py
 unique_campaigns = {}
@@ -70,6 +92,22 @@ N_ADS    = len(rows)
 ADSET_BASE = N_ADS + 1
 CAMP_BASE  = N_ADS + len(unique_adsets) + 1
 
+def load_entities(raw):
+    """Parsed extracted_entities dict, or None if the cell is not a JSON object."""
+    try:
+        ent = json.loads(raw)
+    except ValueError:
+        return None
+    return ent if isinstance(ent, dict) else None
+
+# extracted_entities parsed once; Part 1 reads the dicts from here
+ent_arr = [load_entities(r['extracted_entities']) for r in rows]
+
+# Numeric columns, parsed once (row i ↔ ad id i+1)
+roas_arr  = np.array([safe_float(r['roas'])        for r in rows])
+spend_arr = np.array([safe_float(r['total_spend']) for r in rows])
+ctr_arr   = np.array([safe_float(r['ctr'])         for r in rows])
+
 print("=" * 65)
 print("  Feather DB v0.5.0 — Context + Multimodal + Decay Demo")
 print("=" * 65)
@@ -98,61 +136,64 @@ ENTITY_KEYS = [
 
 # Collect all token values for vocabulary
 all_tokens = []
-for r in rows:
-    try:
-        ent = json.loads(r['extracted_entities'])
-        for k in ENTITY_KEYS:
-            val = ent.get(k, '')
-            if val and val != 'None':
-                tokens = re.split(r'[,/\s]+', str(val).lower())
-                all_tokens.extend([t.strip() for t in tokens if len(t.strip()) > 2])
-    except:
-        pass
+for ent in ent_arr:
+    if ent is None: continue
+    for k in ENTITY_KEYS:
+        val = ent.get(k, '')
+        if val and val != 'None':
+            tokens = TOKEN_RE.split(str(val).lower())
+            all_tokens.extend([t.strip() for t in tokens if len(t.strip()) > 2])
 
 # Build vocab: top 120 terms → 128-dim vector (last 8 dims = misc features)
+VOCAB_SIZE = 120
 from collections import Counter
 freq = Counter(all_tokens)
-vocab = [term for term, _ in freq.most_common(120)]
+vocab = [term for term, _ in freq.most_common(VOCAB_SIZE)]
 vocab_idx = {t: i for i, t in enumerate(vocab)}
 print(f"   Vocabulary size: {len(vocab)} terms")
 print(f"   Top terms: {vocab[:15]}")
 
-def text_to_vec(text_content, extracted_json_str):
-    """TF-IDF style 128-dim embedding from text + extracted entities."""
+def text_features(text_content, ent):
+    """Raw 128-dim features: vocab term counts (0-119) + content features (120-127)."""
     vec = np.zeros(128, dtype=np.float32)
-    try:
-        ent = json.loads(extracted_json_str)
-        for k in ENTITY_KEYS:
-            val = ent.get(k, '')
-            if val and val != 'None':
-                tokens = re.split(r'[,/\s]+', str(val).lower())
-                for t in tokens:
-                    t = t.strip()
-                    if t in vocab_idx:
-                        vec[vocab_idx[t]] += 1.0
-    except:
-        pass
+    tokens = [t.strip()
+              for k in ENTITY_KEYS
+              for val in (ent.get(k, ''),) if val and val != 'None'
+              for t in TOKEN_RE.split(str(val).lower())]
+    # term counts in one bincount instead of a += per token
+    idx = np.fromiter((vocab_idx[t] for t in tokens if t in vocab_idx), dtype=np.intp)
+    vec[:VOCAB_SIZE] = np.bincount(idx, minlength=VOCAB_SIZE)
     # dims 120-127: misc numeric features from the content string
-    words = text_content.lower().split()
+    tc_lower = text_content.lower()
+    words = tc_lower.split()
     vec[120] = len(words) / 50.0                        # content length
-    vec[121] = 1.0 if 'video' in text_content.lower() else 0.0
-    vec[122] = 1.0 if 'static' in text_content.lower() else 0.0
-    vec[123] = 1.0 if any(w in text_content.lower() for w in ['roas','ctr','rate']) else 0.0
-    vec[124] = 1.0 if any(c.isdigit() for c in text_content) else 0.0
+    vec[121] = 1.0 if 'video' in tc_lower else 0.0
+    vec[122] = 1.0 if 'static' in tc_lower else 0.0
+    vec[123] = 1.0 if ('roas' in tc_lower or 'ctr' in tc_lower or 'rate' in tc_lower) else 0.0
+    vec[124] = 1.0 if DIGIT_RE.search(text_content) else 0.0
     vec[125] = float(len(text_content)) / 500.0
-    # stable hash noise for uniqueness
-    h = int(hashlib.md5(text_content.encode()).hexdigest(), 16) % (2**32)
-    rng = np.random.default_rng(h)
-    vec[126:128] = rng.random(2).astype(np.float32) * 0.05
-    norm = np.linalg.norm(vec)
-    return vec / norm if norm > 0 else vec
+    # stable hash noise for uniqueness: two 16-bit slices of the hash, no RNG
+    h = hash32(text_content.encode())
+    vec[126] = (h & 0xFFFF) / 65536.0 * 0.05
+    vec[127] = (h >> 16) / 65536.0 * 0.05
+    return vec
+
+def tfidf(F):
+    """Weight the term-count columns by IDF and L2-normalize every row (in place)."""
+    F[:, :VOCAB_SIZE] *= IDF
+    norms = np.linalg.norm(F, axis=1, keepdims=True)
+    F /= np.where(norms > 0, norms, 1.0)
+    return F
+
+def text_to_vec(text_content, ent):
+    """TF-IDF 128-dim embedding from text + extracted entities dict (needs IDF)."""
+    return tfidf(text_features(text_content, ent)[None, :])[0]
 
 # ── Build insight text from extracted_entities ───────────────────
-def build_insight_text(r):
-    try:
-        ent = json.loads(r['extracted_entities'])
-    except:
-        return f"Ad insight for {r['ad_name']}"
+def build_insight_text(i):
+    ent = ent_arr[i]
+    if ent is None:
+        return f"Ad insight for {rows[i]['ad_name']}"
 
     parts = []
     def add(key, label):
@@ -177,10 +218,7 @@ def build_insight_text(r):
     add('Hook Type',               'Hook')
     add('Dialogues',               'Script')
 
-    roas  = safe_float(r['roas'])
-    spend = safe_float(r['total_spend'])
-    ctr   = safe_float(r['ctr'])
-    parts.append(f"ROAS: {roas:.2f}x | Spend: {spend:,.0f} | CTR: {ctr:.2%}")
+    parts.append(f"ROAS: {roas_arr[i]:.2f}x | Spend: {spend_arr[i]:,.0f} | CTR: {ctr_arr[i]:.2%}")
 
     return ' | '.join(parts)
 
@@ -188,39 +226,45 @@ def build_insight_text(r):
 print("\n[1.2] Inserting insight nodes (one per ad)...")
 INSIGHT_BASE = db.size() + 1  # start after existing nodes
 
-inserted = 0
-for i, r in enumerate(rows):
-    ad_id      = int(r['row_num'])
-    insight_id = INSIGHT_BASE + i
-
-    insight_text = build_insight_text(r)
-    roas  = safe_float(r['roas'])
-    spend = safe_float(r['total_spend'])
-    imp   = min(0.4 + 0.6 * math.log1p(spend) / math.log1p(6_131_954), 1.0)
+# Embed the whole corpus as one (N, 128) matrix: term counts → IDF → L2 rows
+insight_texts = [build_insight_text(i) for i in range(N_ADS)]
+INSIGHT_VECS  = np.stack([text_features(t, ent or {})
+                          for t, ent in zip(insight_texts, ent_arr)])
+df  = np.count_nonzero(INSIGHT_VECS[:, :VOCAB_SIZE], axis=0)
+IDF = np.log(len(rows) / np.maximum(df, 1)).astype(np.float32)
+tfidf(INSIGHT_VECS)
+insight_imp = np.minimum(0.4 + 0.6 * np.log1p(spend_arr) / math.log1p(6_131_954), 1.0)
 
+metas = []
+for i, r in enumerate(rows):
     m = Metadata()
     m.timestamp    = int(time.time()) - (365 - i % 365) * 86400  # spread over a year
     m.type         = ContextType.FACT
     m.source       = "extracted_entities"
-    m.content      = insight_text[:200]   # safe ASCII truncation
-    m.importance   = imp
+    m.content      = insight_texts[i][:200]   # safe ASCII truncation
+    m.importance   = float(insight_imp[i])
     m.namespace_id = "hawky_meta"
     m.entity_id    = r['ad_id']
-    m.set_attribute("record_type",  "insight")
-    m.set_attribute("ad_name",      r['ad_name'])
-    m.set_attribute("roas",         str(round(roas, 4)))
-    m.set_attribute("spend",        str(round(spend, 2)))
-
-    vec = text_to_vec(insight_text, r['extracted_entities'])
-    db.add(id=insight_id, vec=vec, modality="insights")
-
-    # Link: insight derived_from ad
-    db.link(insight_id, ad_id, RelType.DERIVED_FROM, weight=1.0)
-    # If high performer, link ad caused_by this insight
-    if roas > 10:
-        db.link(ad_id, insight_id, RelType.CAUSED_BY, weight=min(roas/100.0, 1.0))
-
-    inserted += 1
+    m.set_attributes({
+        "record_type": "insight",
+        "ad_name":     r['ad_name'],
+        "roas":        str(round(roas_arr[i], 4)),
+        "spend":       str(round(spend_arr[i], 2)),
+    })
+    metas.append(m)
+
+# One bulk insert (parallel HNSW build) + one link_many per edge type
+ad_ids      = np.arange(1, N_ADS + 1, dtype=np.int64)
+insight_ids = INSIGHT_BASE + np.arange(N_ADS, dtype=np.int64)
+db.add_batch(insight_ids, INSIGHT_VECS, metas=metas, modality="insights")
+inserted = N_ADS
+
+# Link: insight derived_from ad
+db.link_many(insight_ids, ad_ids, RelType.DERIVED_FROM)
+# If high performer, link ad caused_by this insight
+hi = roas_arr > 10
+db.link_many(ad_ids[hi], insight_ids[hi], RelType.CAUSED_BY,
+             np.minimum(roas_arr[hi] / 100.0, 1.0))
 
 print(f"   {inserted} insight nodes inserted (modality='insights', dim=128)")
 print(f"   DB size now: {db.size()} nodes")
@@ -228,7 +272,7 @@ print(f"   DB size now: {db.size()} nodes")
 # ── Semantic search over insights ────────────────────────────────
 print("\n[1.3] Semantic search over insights...")
 q_insight = "airport lounge credit card exclusivity benefits"
-q_vec = text_to_vec(q_insight, '{}')
+q_vec = text_to_vec(q_insight, {})
 
 # search the insights modality
 f = FilterBuilder().namespace("hawky_meta").attribute("record_type", "insight")
@@ -247,11 +291,41 @@ print("\n" + "=" * 65)
 print("  PART 2 — VISUAL EMBEDDINGS (Real Image Downloads)")
 print("=" * 65)
 
-def download_image(url, timeout=6):
+DOWNLOAD_WORKERS = 16   # downloads are network-bound; threads overlap the waits
+
+HTTP_HEADERS = {'User-Agent': 'Mozilla/5.0',
+                'Accept-Encoding': 'identity'}   # JPEG/webp/mp4 are already compressed
+
+# urllib3 (optional) keeps keep-alive connections pooled across downloads, so
+# the many same-host URLs skip a TCP+TLS handshake each; else plain urllib.
+try:
+    import urllib3
+    HTTP = urllib3.PoolManager(num_pools=4, maxsize=DOWNLOAD_WORKERS,
+                               retries=urllib3.Retry(total=None, connect=0, read=0, other=0,
+                                                     status=0, redirect=5))
+except ImportError:
+    HTTP = None
+
+def download_image(url, timeout=6, headers=None):
     """Download image bytes from URL."""
-    req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        return resp.read()
+    headers = {**HTTP_HEADERS, **(headers or {})}
+    if HTTP is None:
+        req = urllib.request.Request(url, headers=headers)
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return resp.read()
+    resp = HTTP.request('GET', url, headers=headers, timeout=timeout)
+    if resp.status >= 400:
+        raise OSError(f"HTTP {resp.status} for {url}")
+    return resp.data
+
+def hist_percentile(counts, n, q):
+    """np.percentile(arr, q) (linear interpolation) from arr's byte histogram."""
+    pos = np.asarray(q, dtype=np.float64) / 100.0 * (n - 1)
+    lo = np.floor(pos)
+    cum = np.cumsum(counts)
+    v_lo = np.searchsorted(cum, lo, side='right')          # sorted(arr)[lo]
+    v_hi = np.searchsorted(cum, np.ceil(pos), side='right')
+    return v_lo + (v_hi - v_lo) * (pos - lo)
 
 def webp_to_visual_vec(img_bytes, dim=128):
     """
@@ -261,41 +335,45 @@ def webp_to_visual_vec(img_bytes, dim=128):
     byte entropy, high-freq content (edges/texture proxy).
     Not CLIP — but captures real image-level signal differences.
     """
-    arr = np.frombuffer(img_bytes, dtype=np.uint8).astype(np.float32)
+    # Stays uint8 (no float32 copy): reductions promote to float64 themselves
+    arr = np.frombuffer(img_bytes, dtype=np.uint8)
     vec = np.zeros(dim, dtype=np.float32)
 
+    # One pass over the buffer: every whole-image statistic below is read off
+    # this 256-bin byte histogram instead of re-scanning the bytes per stat.
+    counts = np.bincount(arr, minlength=256)
+    n = arr.size
+    levels = np.arange(256, dtype=np.float64)
+    mean = counts @ levels / n
+
     # Overall byte statistics (dims 0-15)
-    vec[0] = arr.mean() / 255.0
-    vec[1] = arr.std() / 255.0
-    vec[2] = np.percentile(arr, 25) / 255.0
-    vec[3] = np.percentile(arr, 75) / 255.0
-    vec[4] = (arr > 200).mean()   # bright pixel ratio
-    vec[5] = (arr < 50).mean()    # dark pixel ratio
+    vec[0] = mean / 255.0
+    vec[1] = math.sqrt(max(counts @ (levels - mean) ** 2 / n, 0.0)) / 255.0
+    vec[2:4] = hist_percentile(counts, n, [25, 75]) / 255.0
+    vec[4] = counts[201:].sum() / n    # bright pixel ratio
+    vec[5] = counts[:50].sum() / n     # dark pixel ratio
     vec[6] = float(len(img_bytes)) / 200_000.0  # file size proxy
 
-    # Byte histogram (16 buckets, dims 7-22)
-    hist, _ = np.histogram(arr, bins=16, range=(0, 256))
-    hist_norm = hist.astype(np.float32) / hist.sum()
-    vec[7:23] = hist_norm
+    # Byte histogram (16 buckets, dims 7-22) — the 256 bins folded to 16
+    hist = counts.reshape(16, 16).sum(axis=1)
+    vec[7:23] = hist.astype(np.float32) / n
 
     # Chunk-level variance (texture/complexity proxy, dims 23-54)
-    chunk_size = max(len(arr) // 32, 1)
-    for ci in range(32):
-        chunk = arr[ci*chunk_size:(ci+1)*chunk_size]
-        vec[23 + ci] = chunk.std() / 128.0 if len(chunk) > 0 else 0.0
+    # (fewer than 32 bytes → 1-byte chunks, all std 0)
+    chunk_size = len(arr) // 32
+    if chunk_size > 0:
+        vec[23:55] = arr[:32 * chunk_size].reshape(32, chunk_size).std(axis=1) / 128.0
 
     # Byte difference (edge proxy, dims 55-70)
     if len(arr) > 1:
-        diffs = np.abs(np.diff(arr[:min(len(arr), 10000)])).astype(np.float32)
-        diff_hist, _ = np.histogram(diffs, bins=16, range=(0, 256))
+        diffs = np.abs(np.diff(arr[:10000].astype(np.int16)))
+        diff_hist = np.bincount(diffs, minlength=256).reshape(16, 16).sum(axis=1)
         vec[55:71] = diff_hist.astype(np.float32) / (diff_hist.sum() + 1e-9)
 
     # High-frequency content (dims 71-86)
     if len(arr) > 100:
-        sample = arr[:min(len(arr), 5000)]
-        for qi in range(16):
-            lo, hi = qi * 16, (qi+1) * 16
-            vec[71 + qi] = ((sample >= lo) & (sample < hi)).mean()
+        sample = arr[:5000]
+        vec[71:87] = np.bincount(sample >> 4, minlength=16) / len(sample)
 
     # File format signature bytes as fingerprint (dims 87-95)
     sig_bytes = arr[:min(len(arr), 64)]
@@ -304,13 +382,31 @@ def webp_to_visual_vec(img_bytes, dim=128):
     vec[89] = sig_bytes.std() / 255.0
 
     # Stable hash noise (dims 96-127) — makes same-image deterministic
-    h = int(hashlib.md5(img_bytes[:512]).hexdigest(), 16) % (2**32)
+    h = hash32(img_bytes[:512])
     rng = np.random.default_rng(h)
     vec[96:128] = rng.random(32).astype(np.float32) * 0.1
 
     norm = np.linalg.norm(vec)
     return vec / norm if norm > 0 else vec
 
+# Visual vectors are cached on disk by URL, so reruns skip download + feature
+# extraction entirely. Clear CACHE_DIR after changing webp_to_visual_vec; the
+# seed hash is part of the key so md5- and xxhash-seeded vectors never mix.
+CACHE_DIR = '/tmp/feather_vis_cache'
+
+def cached_visual_vec(url, **download_kwargs):
+    """Return (visual vec, cache_hit) for url — download + embed only on a miss."""
+    path = os.path.join(CACHE_DIR, hashlib.sha256(url.encode()).hexdigest()[:32] + f'.{HASH_NAME}.npy')
+    if os.path.exists(path):
+        return np.load(path), True
+    vec = webp_to_visual_vec(download_image(url, **download_kwargs))
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        np.save(f, vec)
+    os.replace(tmp, path)   # atomic: a concurrent reader never sees a partial file
+    return vec, False
+
 print("\n[2.1] Downloading real ad images and computing visual embeddings...")
 print("      (byte-level visual features: brightness, texture, histogram, entropy)")
 
@@ -321,56 +417,65 @@ video_rows = [r for r in rows if 'videos' in r['url']]
 MAX_IMAGES = 30
 MAX_VIDEOS = 10
 
-visual_inserted = 0
 failed = 0
-
-for r in img_rows[:MAX_IMAGES]:
+cache_hits = cache_misses = 0
+
+# Downloads run concurrently; results are consumed in row order on the main
+# thread, so every db call stays single-threaded.
+with ThreadPoolExecutor(DOWNLOAD_WORKERS) as ex:
+    downloads = [(r, ex.submit(cached_visual_vec, r['url'])) for r in img_rows[:MAX_IMAGES]]
+vis_ids, vis_vecs, vis_metas = [], [], []
+for r, fut in downloads:
     ad_id = int(r['row_num'])
     try:
-        img_bytes = download_image(r['url'])
-        vis_vec   = webp_to_visual_vec(img_bytes)
-
-        m = db.get_metadata(ad_id)
-        if m is None:
-            m = Metadata()
-            m.namespace_id = "hawky_meta"
-            m.entity_id    = r['ad_id']
-            m.source       = "visual_embed"
-            m.content      = r['ad_name']
-            m.importance   = safe_float(r['roas'], 1.0) / 100.0
-
-        db.add(id=ad_id, vec=vis_vec, modality="visual")
-
-        # Link visual ↔ text modality
-        db.link(ad_id, ad_id, RelType.MULTIMODAL_OF, weight=1.0)
-        visual_inserted += 1
-        if visual_inserted % 10 == 0:
-            print(f"   [{visual_inserted}] images processed...")
+        vis_vec, hit = fut.result()
     except Exception as e:
         failed += 1
+        continue
+    cache_hits += hit
+    cache_misses += not hit
+
+    # Re-pass the ad's metadata: add() replaces the record's metadata
+    m = db.get_metadata(ad_id)
+    if m is None:
+        m = Metadata()
+        m.namespace_id = "hawky_meta"
+        m.entity_id    = r['ad_id']
+        m.source       = "visual_embed"
+        m.content      = r['ad_name']
+        m.importance   = safe_float(r['roas'], 1.0) / 100.0
+    vis_ids.append(ad_id); vis_vecs.append(vis_vec); vis_metas.append(m)
+
+if vis_ids:
+    db.add_batch(vis_ids, np.stack(vis_vecs), metas=vis_metas, modality="visual")
+    # Link visual ↔ text modality
+    db.link_many(vis_ids, vis_ids, RelType.MULTIMODAL_OF)
+visual_inserted = len(vis_ids)
 
 print(f"\n   Images: {visual_inserted} visual embeddings created  ({failed} failed)")
+print(f"   Visual cache ({CACHE_DIR}): {cache_hits} hits, {cache_misses} misses")
 print(f"   Modality dims — text:{db.dim('text')}  insights:{db.dim('insights')}  visual:{db.dim('visual')}")
 
 # Also process a few video URLs (download first ~100KB for header features)
 print(f"\n[2.2] Processing video URLs (header bytes as visual fingerprint)...")
-vid_inserted = 0
-for r in video_rows[:MAX_VIDEOS]:
+with ThreadPoolExecutor(DOWNLOAD_WORKERS) as ex:
+    downloads = [(r, ex.submit(cached_visual_vec, r['url'], timeout=8,
+                               headers={'Range': 'bytes=0-131071'}))   # first 128KB only
+                 for r in video_rows[:MAX_VIDEOS]]
+vid_ids, vid_vecs, vid_metas = [], [], []
+for r, fut in downloads:
     ad_id = int(r['row_num'])
     try:
-        req = urllib.request.Request(r['url'], headers={
-            'User-Agent': 'Mozilla/5.0',
-            'Range': 'bytes=0-131071'   # first 128KB only
-        })
-        with urllib.request.urlopen(req, timeout=8) as resp:
-            vid_bytes = resp.read()
-
-        vis_vec = webp_to_visual_vec(vid_bytes, dim=128)
-        db.add(id=ad_id, vec=vis_vec, modality="visual")
-        db.link(ad_id, ad_id, RelType.MULTIMODAL_OF, weight=1.0)
-        vid_inserted += 1
+        vis_vec, _ = fut.result()
     except Exception as e:
-        pass
+        continue
+    vid_ids.append(ad_id); vid_vecs.append(vis_vec)
+    vid_metas.append(db.get_metadata(ad_id) or Metadata())
+
+if vid_ids:
+    db.add_batch(vid_ids, np.stack(vid_vecs), metas=vid_metas, modality="visual")
+    db.link_many(vid_ids, vid_ids, RelType.MULTIMODAL_OF)
+vid_inserted = len(vid_ids)
 
 print(f"   Videos: {vid_inserted} visual embeddings from video headers")
 
@@ -411,36 +516,25 @@ print("=" * 65)
 
 # ── 3.1: Feed ROAS as importance signal ──────────────────────────
 print("\n[3.1] Feeding real ROAS as importance signal (update_importance)...")
-updated = 0
-for r in rows:
-    ad_id = int(r['row_num'])
-    roas  = safe_float(r['roas'])
-    spend = safe_float(r['total_spend'])
-
-    # Importance = normalized ROAS signal (log-scaled, capped at 1.0)
-    if roas > 0:
-        imp = min(math.log1p(roas) / math.log1p(5000), 1.0)
-    else:
-        # low importance for zero-ROAS, weighted by spend (you paid for it)
-        imp = max(0.05, 0.1 * math.log1p(spend) / math.log1p(6_000_000))
-
-    db.update_importance(ad_id, imp)
-    updated += 1
+# Importance = normalized ROAS signal (log-scaled, capped at 1.0); zero-ROAS
+# ads get a low importance weighted by spend (you paid for it)
+ad_imp = np.where(roas_arr > 0,
+                  np.minimum(np.log1p(np.maximum(roas_arr, 0)) / math.log1p(5000), 1.0),
+                  np.maximum(0.05, 0.1 * np.log1p(spend_arr) / math.log1p(6_000_000)))
+db.update_importance_many(ad_ids, ad_imp)
+updated = N_ADS
 
 print(f"   {updated} ads updated with ROAS-derived importance")
 print("   Importance formula: log(1 + ROAS) / log(1 + 5000)  — capped at 1.0")
 
 # ── 3.2: Simulate access patterns (touch high-value ads) ─────────
 print("\n[3.2] Simulating access patterns (touching high-ROAS ads more)...")
-high_roas_ads = sorted(
-    [(int(r['row_num']), safe_float(r['roas'])) for r in rows if safe_float(r['roas']) > 50],
-    key=lambda x: -x[1]
-)[:20]
+pos = np.flatnonzero(roas_arr > 50)
+pos = pos[np.argsort(-roas_arr[pos], kind='stable')[:20]]
+high_roas_ads = [(int(rows[i]['row_num']), roas_arr[i]) for i in pos]
 
-for ad_id, roas in high_roas_ads:
-    touches = min(int(math.log1p(roas)), 10)
-    for _ in range(touches):
-        db.touch(ad_id)
+touches = [min(int(math.log1p(roas)), 10) for _, roas in high_roas_ads]
+db.touch_many(np.repeat([ad_id for ad_id, _ in high_roas_ads], touches))
 
 print(f"   Touched {len(high_roas_ads)} high-ROAS ads (top-20)")
 print("   recall_count now elevated → stickiness formula: 1 + log(1 + recall_count)")
@@ -450,61 +544,71 @@ print("\n[3.3] Comparing raw similarity vs time-decay scoring...")
 query_r = rows[0]  # anchor: first ad
 
 import hashlib as _h
-def make_embedding_local(r):
-    PRODUCT_MAP2 = {'CC': 0, 'FD': 1, 'MF': 2, 'SB': 3, 'Bonds': 4, 'Bond': 4,
-                    'RD': 5, 'AppPromotion': 6, 'RET': 7, 'Ret': 7, 'SM': 8}
-    OBJ_MAP2 = {'Purchase': 0, 'Installs': 1, 'Registration': 2,
-                'Traffic': 3, 'Clicks': 3, 'Awareness': 4}
-    GEO_MAP2 = {'Metro': 0, 'South': 1, 'TamilNadu': 2, 'KL': 3,
-                'ROI': 4, 'India': 5, 'INT': 6}
-    CREATIVE_MAP2 = {'Static': 0, 'Video': 1, 'Carousel': 2, 'Reel': 3, 'DSA': 4}
-    def extract(name, m):
-        for k in m:
-            if k in name: return k
-        return 'unknown'
-    def oh16(val, m):
-        v = np.zeros(16, dtype=np.float32)
-        v[m.get(val, 15) % 16] = 1.0
-        return v
-    def roas_v(x):
-        v = np.zeros(16, dtype=np.float32)
-        if x<=0: v[0]=1.
-        elif x<1: v[1]=1.; v[2]=x
-        elif x<5: v[2]=1.; v[3]=x/5
-        elif x<20: v[3]=1.; v[4]=x/20
-        else: v[4]=1.; v[5]=min(x/100,1.)
+PRODUCT_MAP2 = {'CC': 0, 'FD': 1, 'MF': 2, 'SB': 3, 'Bonds': 4, 'Bond': 4,
+                'RD': 5, 'AppPromotion': 6, 'RET': 7, 'Ret': 7, 'SM': 8}
+OBJ_MAP2 = {'Purchase': 0, 'Installs': 1, 'Registration': 2,
+            'Traffic': 3, 'Clicks': 3, 'Awareness': 4}
+GEO_MAP2 = {'Metro': 0, 'South': 1, 'TamilNadu': 2, 'KL': 3,
+            'ROI': 4, 'India': 5, 'INT': 6}
+CREATIVE_MAP2 = {'Static': 0, 'Video': 1, 'Carousel': 2, 'Reel': 3, 'DSA': 4}
+
+def key_regex(m):
+    """One compiled alternation per map. Anchored `^(?:.*?(k1)|.*?(k2)|...)`
+    tries the keys in dict order, so the winner is the first key of the map
+    found anywhere in the name — same answer as the old linear `k in name`
+    scan, but the scan runs inside the C regex engine."""
+    return re.compile('^(?:' + '|'.join(f'.*?({re.escape(k)})' for k in m) + ')', re.S)
+
+PRODUCT_RE, OBJ_RE, GEO_RE, CREATIVE_RE = map(key_regex, (PRODUCT_MAP2, OBJ_MAP2,
+                                                          GEO_MAP2, CREATIVE_MAP2))
+
+def extract(name, rx):
+    hit = rx.match(name)
+    return hit.group(hit.lastindex) if hit else 'unknown'
+
+# Tier encodings: x <= 0 → slot 0; otherwise tier t = 1 + #edges <= x sets
+# slot t, and slot t+1 gets x / scale[t-1] (None: top tier, no fraction).
+ROAS_EDGES,  ROAS_SCALES  = np.array([1, 5, 20]), (1, 5, 20, 100)
+SPEND_EDGES, SPEND_SCALES = np.array([1e3, 1e4, 1e5, 1e6]), (1e3, 1e4, 1e5, 1e6, None)
+CTR_EDGES,   CTR_SCALES   = np.array([0.5, 1.5, 3.0]), (0.5, 1.5, 3.0, None)
+
+def tier_vec(x, edges, scales):
+    v = np.zeros(16, dtype=np.float32)
+    if x <= 0:
+        v[0] = 1.
         return v
-    def spend_v(x):
-        v = np.zeros(16, dtype=np.float32)
-        if x<=0: v[0]=1.
-        elif x<1000: v[1]=1.; v[2]=x/1000
-        elif x<10000: v[2]=1.; v[3]=x/10000
-        elif x<100000: v[3]=1.; v[4]=x/100000
-        elif x<1000000: v[4]=1.; v[5]=x/1000000
-        else: v[5]=1.
-        return v
-    def ctr_v(x):
-        v = np.zeros(16, dtype=np.float32)
-        if x<=0: v[0]=1.
-        elif x<0.5: v[1]=1.; v[2]=x/0.5
-        elif x<1.5: v[2]=1.; v[3]=x/1.5
-        elif x<3.0: v[3]=1.; v[4]=x/3.0
-        else: v[4]=1.
-        return v
-    def cnoise(cid):
-        h = int(hashlib.md5(cid.encode()).hexdigest(), 16)
-        return np.random.default_rng(h % (2**32)).random(16).astype(np.float32) * 0.15
-
-    product  = extract(r['campaign_name'], PRODUCT_MAP2)
-    obj      = extract(r['campaign_name'], OBJ_MAP2)
-    geo      = extract(r['adset_name'], GEO_MAP2)
-    creative = extract(r['ad_name'], CREATIVE_MAP2)
+    t = 1 + int(np.searchsorted(edges, x, side='right'))
+    v[t] = 1.
+    if scales[t - 1] is not None:
+        v[t + 1] = min(x / scales[t - 1], 1.)
+    return v
+
+def oh16(val, m):
+    v = np.zeros(16, dtype=np.float32)
+    v[m.get(val, 15) % 16] = 1.0
+    return v
+
+@functools.lru_cache(maxsize=4096)
+def cnoise(cid):
+    """Per-campaign noise, drawn once per campaign_id (read-only: it is shared)."""
+    h = int(hashlib.md5(cid.encode()).hexdigest(), 16)
+    v = np.random.default_rng(h % (2**32)).random(16).astype(np.float32) * 0.15
+    v.setflags(write=False)
+    return v
+
+def make_embedding_local(r):
+    product  = extract(r['campaign_name'], PRODUCT_RE)
+    obj      = extract(r['campaign_name'], OBJ_RE)
+    geo      = extract(r['adset_name'], GEO_RE)
+    creative = extract(r['ad_name'], CREATIVE_RE)
     roas     = safe_float(r['roas'])
     spend    = safe_float(r['total_spend'])
     ctr      = safe_float(r['ctr'])
     vec = np.concatenate([oh16(product,PRODUCT_MAP2), oh16(obj,OBJ_MAP2),
                           oh16(geo,GEO_MAP2), oh16(creative,CREATIVE_MAP2),
-                          roas_v(roas), spend_v(spend), ctr_v(ctr), cnoise(r['campaign_id'])])
+                          tier_vec(roas, ROAS_EDGES, ROAS_SCALES),
+                          tier_vec(spend, SPEND_EDGES, SPEND_SCALES),
+                          tier_vec(ctr, CTR_EDGES, CTR_SCALES), cnoise(r['campaign_id'])])
     norm = np.linalg.norm(vec)
     return vec / norm if norm > 0 else vec
 
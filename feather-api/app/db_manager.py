@@ -10,14 +10,18 @@ This provides full storage-level isolation between tenants.
     hospital_a.feather
     ...
 
-Thread safety: reads are safe; writes use a per-namespace lock.
+Thread safety: each namespace has a readers-writer lock. Any number of
+read_lock() holders run together; write_lock() waits for them and excludes
+everyone else.
 """
 
 import os
 import sys
 import struct
 import threading
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, NamedTuple, Optional
 from feather_db import DB
 
 
@@ -58,12 +62,62 @@ def _validate_feather_header(path: str) -> int:
     return version
 
 
+class RWLock:
+    """Readers-writer lock. Many concurrent readers, one exclusive writer.
+
+    Writer-preferring: once a writer is waiting, new readers queue behind it,
+    so a steady stream of searches cannot starve an ingest.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if self._readers == 0:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        with self._cond:
+            self._writers_waiting += 1
+            try:
+                while self._writer or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class Handle(NamedTuple):
+    """A namespace's DB together with its lock — one dict lookup yields both."""
+    db: DB
+    lock: RWLock
+
+
 class DBManager:
     def __init__(self, data_dir: str = DATA_DIR, default_dim: int = DEFAULT_DIM):
         self._data_dir = data_dir
         self._default_dim = default_dim
-        self._dbs: Dict[str, DB] = {}
-        self._locks: Dict[str, threading.Lock] = {}
+        self._handles: Dict[str, Handle] = {}
         self._global_lock = threading.Lock()
 
         os.makedirs(data_dir, exist_ok=True)
@@ -71,17 +125,27 @@ class DBManager:
 
     def _load_existing(self):
         """Load all .feather files found in data_dir on startup. A single
-        corrupt file must not take down the whole server — skip + log it."""
-        for fname in sorted(os.listdir(self._data_dir)):
-            if fname.endswith(".feather"):
-                ns = fname[:-len(".feather")]
-                try:
-                    self._open_namespace(ns)
-                except Exception as e:  # noqa: BLE001 — never crash startup on one bad file
-                    self._dbs.pop(ns, None)
-                    self._locks.pop(ns, None)
-                    print(f"[db_manager] skipping unloadable namespace '{ns}': {e}",
-                          file=sys.stderr)
+        corrupt file must not take down the whole server — skip + log it.
+
+        Files are opened in parallel (DB.open releases the GIL), so startup
+        costs roughly the slowest namespace rather than the sum of all."""
+        with os.scandir(self._data_dir) as it:
+            names = sorted(e.name[:-len(".feather")] for e in it
+                           if e.name.endswith(".feather") and e.is_file())
+        if not names:
+            return
+        workers = min(32, (os.cpu_count() or 1) * 4, len(names))
+        with ThreadPoolExecutor(workers) as ex:
+            futures = [(ns, ex.submit(self._open_db, ns)) for ns in names]
+        for ns, fut in futures:
+            try:
+                db = fut.result()
+            except Exception as e:  # noqa: BLE001 — never crash startup on one bad file
+                print(f"[db_manager] skipping unloadable namespace '{ns}': {e}",
+                      file=sys.stderr)
+                continue
+            with self._global_lock:
+                self._handles[ns] = Handle(db, RWLock())
 
     def data_dir(self) -> str:
         return self._data_dir
@@ -93,27 +157,38 @@ class DBManager:
             raise ValueError(f"Invalid namespace: {namespace!r}")
         return os.path.join(self._data_dir, f"{safe}.feather")
 
-    def _open_namespace(self, namespace: str, dim: Optional[int] = None) -> DB:
+    def _open_db(self, namespace: str, dim: Optional[int] = None) -> DB:
         path = self._namespace_path(namespace)
         # `dim` only sets the reported default for a brand-new empty namespace;
         # an existing file keeps its own dim, and the first inserted vector is
         # what truly fixes it. So passing dim here never overrides real data.
-        db = DB.open(path, dim=dim or self._default_dim)
-        self._dbs[namespace] = db
-        self._locks[namespace] = threading.Lock()
+        return DB.open(path, dim=dim or self._default_dim)
+
+    def _open_namespace(self, namespace: str, dim: Optional[int] = None) -> DB:
+        """Open and register a namespace. Caller holds `_global_lock`."""
+        db = self._open_db(namespace, dim=dim)
+        self._handles[namespace] = Handle(db, RWLock())
         return db
 
     def get(self, namespace: str, create: bool = True,
             dim: Optional[int] = None) -> DB:
         """Return the DB for this namespace, creating it if needed."""
-        if namespace in self._dbs:
-            return self._dbs[namespace]
+        return self.handle(namespace, create=create, dim=dim).db
+
+    def handle(self, namespace: str, create: bool = True,
+               dim: Optional[int] = None) -> Handle:
+        """Return (db, lock) for this namespace, creating it if needed."""
+        h = self._handles.get(namespace)
+        if h is not None:
+            return h
         with self._global_lock:
-            if namespace in self._dbs:
-                return self._dbs[namespace]
+            h = self._handles.get(namespace)
+            if h is not None:
+                return h
             if not create:
                 raise KeyError(f"Namespace '{namespace}' not found")
-            return self._open_namespace(namespace, dim=dim)
+            self._open_namespace(namespace, dim=dim)
+            return self._handles[namespace]
 
     def adopt(self, namespace: str, staged_path: str, overwrite: bool = False) -> DB:
         """Adopt an uploaded .feather file as `namespace`.
@@ -134,7 +209,7 @@ class DBManager:
 
         with self._global_lock:
             dest = self._namespace_path(namespace)
-            already = namespace in self._dbs or os.path.exists(dest)
+            already = namespace in self._handles or os.path.exists(dest)
             if already and not overwrite:
                 _safe_remove(staged_path)
                 raise FileExistsError(namespace)
@@ -142,8 +217,7 @@ class DBManager:
             # Drop any live handle first. DB is bound py::nodelete, so dropping
             # the Python reference does NOT call ~DB()/save() — the in-memory
             # state can't clobber the file we're about to move into place.
-            self._dbs.pop(namespace, None)
-            self._locks.pop(namespace, None)
+            self._handles.pop(namespace, None)
 
             # Back up the existing file so a bad upload (or a regretted overwrite)
             # is recoverable. One rolling backup per namespace.
@@ -169,8 +243,7 @@ class DBManager:
             try:
                 return self._open_namespace(namespace)
             except Exception as e:  # noqa: BLE001
-                self._dbs.pop(namespace, None)
-                self._locks.pop(namespace, None)
+                self._handles.pop(namespace, None)
                 _safe_remove(dest)
                 _safe_remove(dest + ".wal")
                 if backup and os.path.exists(backup):
@@ -181,21 +254,48 @@ class DBManager:
                         pass
                 raise ValueError(f"could not load uploaded .feather: {e}")
 
-    def lock(self, namespace: str) -> threading.Lock:
-        """Return the write lock for this namespace."""
-        self.get(namespace)   # ensure it exists
-        return self._locks[namespace]
+    def read_lock(self, namespace: str):
+        """Shared lock for this namespace: `with manager.read_lock(ns): ...`."""
+        return self.handle(namespace).lock.read()
+
+    def write_lock(self, namespace: str):
+        """Exclusive lock for this namespace: `with manager.write_lock(ns): ...`."""
+        return self.handle(namespace).lock.write()
+
+    # Back-compat alias: lock() always meant the write lock.
+    lock = write_lock
 
     def list_namespaces(self):
-        return list(self._dbs.keys())
+        return list(self._handles.keys())
+
+    def save_all(self) -> Dict[str, Optional[str]]:
+        """Save every namespace, in parallel (DB.save releases the GIL, and each
+        namespace is its own file), so flushing N dirty namespaces costs about
+        the slowest one. One failing save doesn't stop the rest.
 
-    def save_all(self):
-        for db in self._dbs.values():
-            db.save()
+        Returns {namespace: None on success, or the error message}."""
+        with self._global_lock:
+            handles = list(self._handles.items())
+        if not handles:
+            return {}
+        workers = min(32, (os.cpu_count() or 1) * 4, len(handles))
+        with ThreadPoolExecutor(workers) as ex:
+            futures = [(ns, ex.submit(h.db.save)) for ns, h in handles]
+        results: Dict[str, Optional[str]] = {}
+        for ns, fut in futures:
+            try:
+                fut.result()
+                results[ns] = None
+            except Exception as e:  # noqa: BLE001 — keep saving the others
+                print(f"[db_manager] save failed for namespace '{ns}': {e}",
+                      file=sys.stderr)
+                results[ns] = str(e)
+        return results
 
     def save(self, namespace: str):
-        if namespace in self._dbs:
-            self._dbs[namespace].save()
+        h = self._handles.get(namespace)
+        if h is not None:
+            h.db.save()
 
     def delete(self, namespace: str) -> bool:
         """Hard-delete a namespace: drop in-memory state + remove .feather and WAL.
@@ -203,15 +303,14 @@ class DBManager:
         """
         with self._global_lock:
             removed = False
-            if namespace in self._dbs:
-                # Trigger destructor flush, then drop the reference so the file
-                # isn't reopened from a stale handle.
+            h = self._handles.pop(namespace, None)
+            if h is not None:
+                # Flush, then drop the reference so the file isn't reopened
+                # from a stale handle.
                 try:
-                    self._dbs[namespace].save()
+                    h.db.save()
                 except Exception:
                     pass
-                del self._dbs[namespace]
-                self._locks.pop(namespace, None)
                 removed = True
             path = self._namespace_path(namespace)
             for p in (path, path + ".wal", path + ".tmp"):
@@ -10,12 +10,17 @@ Endpoints:
   GET  /v1/namespaces/{namespace}/stats
 
   POST /v1/{namespace}/vectors          — add a vector
+  POST /v1/{namespace}/vectors_bin      — add a vector (raw binary body)
+  POST /v1/{namespace}/vectors_i8       — add a vector sent as int8 codes (stored as float32)
+  POST /v1/{namespace}/vectors_bulk     — add many vectors (raw binary body)
   POST /v1/{namespace}/search           — search
+  POST /v1/{namespace}/batch_search     — many searches, NDJSON out
   GET  /v1/{namespace}/records/{id}     — get metadata
   PUT  /v1/{namespace}/records/{id}     — update full metadata
   PUT  /v1/{namespace}/records/{id}/importance  — update importance
   POST /v1/{namespace}/records/{id}/link        — link two records
   POST /v1/{namespace}/save             — flush to disk
+  POST /v1/admin/save_all               — flush every namespace (in parallel)
 
 Authentication: X-API-Key header (set FEATHER_API_KEY env var).
 If FEATHER_API_KEY is unset, auth is disabled (dev mode).
@@ -23,15 +28,22 @@ If FEATHER_API_KEY is unset, auth is disabled (dev mode).
 
 import os
 import time
+import asyncio
+import base64
+import functools
 import logging
 import pathlib
+import struct
 import tempfile
 from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from typing import Optional, List, Tuple, Dict
 
 from fastapi import FastAPI, HTTPException, Depends, Header, Request, UploadFile, File, Form
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, RedirectResponse, Response, StreamingResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
+import pydantic_core
 from fastapi.staticfiles import StaticFiles
 
 import feather_db
@@ -42,11 +54,11 @@ from .db_manager import DBManager
 from .metrics import METRICS, classify, namespace_from_path
 from .embedding import EMBEDDING, SUPPORTED_MODELS
 from .models import (
-    AddVectorRequest, SearchRequest, SearchResponse, SearchResultItem,
+    MetadataIn, AddVectorRequest, AddVectorI8Request, SearchRequest, BatchSearchRequest, SearchResponse, SearchResultItem,
     KeywordSearchRequest, HybridSearchRequest,
     LinkRequest, UpdateImportanceRequest, UpdateMetadataRequest, PurgeRequest,
     BatchDeleteRequest,
-    MetadataOut, NamespaceStats, HealthResponse, AdminOverview,
+    MetadataOut, NamespaceStats, HealthResponse, AdminOverview, ContextTypeEnum,
     SeedRequest, ContextChainRequest, EdgesResponse, EdgeOut, IncomingEdgeOut,
     ContextChainNode, ContextChainEdge, ContextChainResponse,
     CreateNamespaceRequest, NamespaceSchema, SchemaAttribute,
@@ -62,6 +74,7 @@ import random
 
 
 _PROCESS_START = time.time()
+_VERSION = feather_db.__version__   # resolved once, not per /health hit
 
 # ─────────────────────────────────────────────
 # Logging
@@ -73,21 +86,28 @@ logger = logging.getLogger("feather-api")
 # App lifecycle
 # ─────────────────────────────────────────────
 manager: Optional[DBManager] = None
+# Dedicated pool for the CPU-bound core calls made from async routes (search,
+# add). The core releases the GIL inside them, so one worker per core runs
+# them truly in parallel while the event loop keeps accepting requests.
+SEARCH_POOL: Optional[ThreadPoolExecutor] = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global manager
+    global manager, SEARCH_POOL
     logger.info("Starting Feather DB Cloud API...")
     manager = DBManager()
+    SEARCH_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 4,
+                                     thread_name_prefix="feather-search")
     logger.info(f"Loaded namespaces: {manager.list_namespaces()}")
     yield
     logger.info("Shutting down — saving all DBs...")
+    SEARCH_POOL.shutdown(wait=True)
     manager.save_all()
 
 app = FastAPI(
     title="Feather DB Cloud API",
     description="REST API for Feather DB — embedded vector database with living context.",
-    version=feather_db.__version__,
+    version=_VERSION,
     lifespan=lifespan,
 )
 
@@ -160,18 +180,33 @@ def verify_api_key(x_api_key: str = Header(default="")):
 # ─────────────────────────────────────────────
 # Helpers
 # ─────────────────────────────────────────────
+def require_ns(namespace: str):
+    """Dependency: the DB of an existing namespace, else 404. (Plain def so
+    FastAPI runs it in its threadpool: a miss takes DBManager's global lock,
+    which delete/adopt hold while they save or open files.)"""
+    try:
+        return manager.get(namespace, create=False)
+    except KeyError:
+        raise HTTPException(404, f"Namespace '{namespace}' not found")
+
+
+# Core ContextType per API ContextTypeEnum value (indexed, not constructed per
+# request). m_in.type is already validated to this range by pydantic.
+_CONTEXT_TYPES = tuple(ContextType(int(t)) for t in ContextTypeEnum)
+
+
 def _meta_from_model(m_in) -> Metadata:
     meta = Metadata()
-    meta.timestamp       = m_in.timestamp if m_in.timestamp else int(time.time())
+    meta.timestamp       = m_in.timestamp or int(time.time())
     meta.importance      = m_in.importance
-    meta.type            = ContextType(int(m_in.type))
+    meta.type            = _CONTEXT_TYPES[m_in.type]
     meta.source          = m_in.source
     meta.content         = m_in.content
     meta.tags_json       = m_in.tags_json
     meta.namespace_id    = m_in.namespace_id
     meta.entity_id       = m_in.entity_id
-    for k, v in m_in.attributes.items():
-        meta.set_attribute(k, v)
+    if m_in.attributes:
+        meta.set_attributes(m_in.attributes)   # one FFI crossing, not one per key
     return meta
 
 
@@ -185,43 +220,107 @@ def _meta_to_model(meta: Metadata) -> MetadataOut:
         tags_json       = meta.tags_json,
         namespace_id    = meta.namespace_id,
         entity_id       = meta.entity_id,
-        attributes      = dict(meta.attributes),
+        # meta.attributes / meta.links already return fresh copies; skip the
+        # copy (and the FFI call) altogether when they are empty.
+        attributes      = meta.attributes if meta.attributes_len else {},
         recall_count    = meta.recall_count,
         last_recalled_at= meta.last_recalled_at,
-        links           = list(meta.links),
+        links           = meta.links if meta.links_len else [],
     )
 
 
+_META_COLUMNS = ("timestamp", "importance", "type", "source", "content", "tags_json",
+                 "namespace_id", "entity_id", "attributes", "recall_count",
+                 "last_recalled_at", "links")
+
+
+def _columns_to_rows(cols: dict) -> List[dict]:
+    """Search results as plain dicts shaped like SearchResultItem, from
+    db.search_columnar() output: one tolist() per column, then plain zips.
+
+    Skips building a SearchResultItem + MetadataOut pair per hit — the values
+    come straight from the core and already have the response types, so
+    validating them again only costs time. Key order follows _META_COLUMNS,
+    which is MetadataOut's field order, so the JSON is byte-identical."""
+    meta_cols = [cols[c].tolist() if isinstance(cols[c], np.ndarray) else cols[c]
+                 for c in _META_COLUMNS]
+    return [
+        {"id": rid, "score": score, "metadata": dict(zip(_META_COLUMNS, row))}
+        for rid, score, *row in zip(cols["ids"].tolist(), cols["scores"].tolist(), *meta_cols)
+    ]
+
+
+def _json_response(model: BaseModel) -> Response:
+    """Serialize a response model straight to JSON bytes in pydantic-core.
+
+    Returning the model would send it through FastAPI's response_model path,
+    which on older FastAPI releases re-validates it and walks it with
+    jsonable_encoder + json.dumps in pure Python. Search results with full
+    metadata make that the dominant cost of the request."""
+    return Response(model.model_dump_json(), media_type="application/json")
+
+
+# Filters and scoring configs are cached per distinct request signature: a
+# dashboard/tenant reuses a handful of filter templates, so most requests skip
+# building the C++ objects. Safe to share — the core only reads them (const)
+# and nothing mutates a cached object after construction.
 def _build_filter(req: SearchRequest) -> Optional[SearchFilter]:
-    has_filter = any([
-        req.namespace_id, req.entity_id, req.attributes_match,
-        req.source, req.source_prefix, req.importance_gte,
-        req.tags_contains, req.timestamp_after, req.timestamp_before,
-    ])
-    if not has_filter:
+    # Short-circuit `or` chain, most commonly set field first: the unfiltered
+    # (plain RAG) request exits here without building a key or a list.
+    if not (req.namespace_id or req.entity_id or req.attributes_match
+            or req.source or req.source_prefix or req.tags_contains
+            or req.importance_gte or req.timestamp_after or req.timestamp_before):
         return None
+    return _filter_cached(
+        req.namespace_id, req.entity_id,
+        tuple(sorted(req.attributes_match.items())) if req.attributes_match else None,
+        req.source, req.source_prefix, req.importance_gte,
+        tuple(req.tags_contains) if req.tags_contains else None,
+        req.timestamp_after, req.timestamp_before,
+    )
+
 
+@functools.lru_cache(maxsize=1024)
+def _filter_cached(namespace_id, entity_id, attributes_match, source, source_prefix,
+                   importance_gte, tags_contains, timestamp_after,
+                   timestamp_before) -> SearchFilter:
     f = SearchFilter()
-    if req.namespace_id:      f.namespace_id    = req.namespace_id
-    if req.entity_id:         f.entity_id       = req.entity_id
-    if req.attributes_match:  f.attributes_match = req.attributes_match
-    if req.source:            f.source          = req.source
-    if req.source_prefix:     f.source_prefix   = req.source_prefix
-    if req.importance_gte is not None: f.importance_gte = req.importance_gte
-    if req.tags_contains:     f.tags_contains   = req.tags_contains
-    if req.timestamp_after:   f.timestamp_after = req.timestamp_after
-    if req.timestamp_before:  f.timestamp_before = req.timestamp_before
+    if namespace_id:      f.namespace_id    = namespace_id
+    if entity_id:         f.entity_id       = entity_id
+    if attributes_match:  f.attributes_match = dict(attributes_match)
+    if source:            f.source          = source
+    if source_prefix:     f.source_prefix   = source_prefix
+    if importance_gte is not None: f.importance_gte = importance_gte
+    if tags_contains:     f.tags_contains   = list(tags_contains)
+    if timestamp_after:   f.timestamp_after = timestamp_after
+    if timestamp_before:  f.timestamp_before = timestamp_before
     return f
 
 
 def _build_scoring(req: SearchRequest) -> Optional[ScoringConfig]:
     if req.scoring_half_life is None and req.scoring_weight is None:
         return None
-    return ScoringConfig(
-        half_life = req.scoring_half_life or 30.0,
-        weight    = req.scoring_weight    or 0.3,
-        min       = req.scoring_min       or 0.0,
-    )
+    return _scoring_cached(req.scoring_half_life or 30.0,
+                           req.scoring_weight    or 0.3,
+                           req.scoring_min       or 0.0)
+
+
+@functools.lru_cache(maxsize=256)
+def _scoring_cached(half_life: float, weight: float, min_: float) -> ScoringConfig:
+    return ScoringConfig(half_life=half_life, weight=weight, min=min_)
+
+
+def _request_vector(req) -> np.ndarray:
+    """The float32 query/insert vector of a request (`vector` or `vector_b64`)."""
+    if req.vector_b64 is None:
+        return np.asarray(req.vector, dtype=np.float32)
+    try:
+        raw = base64.b64decode(req.vector_b64, validate=True)
+    except ValueError:
+        raise HTTPException(400, "vector_b64 is not valid base64")
+    if not raw or len(raw) % 4:
+        raise HTTPException(400, "vector_b64 must decode to a whole number of float32s")
+    return np.frombuffer(raw, dtype="<f4")
 
 
 def _established_dim(db, modality: str = "text"):
@@ -290,6 +389,12 @@ _IMPORT_SAVE_INTERVAL_S = float(os.getenv("FEATHER_IMPORT_SAVE_INTERVAL_S", "30"
 _last_save: Dict[str, float] = {}
 
 
+async def _in_pool(fn, *args, **kwargs):
+    """Run a blocking core call on SEARCH_POOL without blocking the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(
+        SEARCH_POOL, functools.partial(fn, *args, **kwargs))
+
+
 def _throttled_save(namespace: str, db, force: bool = False) -> bool:
     now = time.time()
     if force or (now - _last_save.get(namespace, 0.0)) >= _IMPORT_SAVE_INTERVAL_S:
@@ -302,15 +407,15 @@ def _throttled_save(namespace: str, db, force: bool = False) -> bool:
 # Routes — health & meta
 # ─────────────────────────────────────────────
 @app.get("/health", response_model=HealthResponse, tags=["meta"])
-def health():
+async def health():
     return HealthResponse(
         status="ok",
-        version=feather_db.__version__,
+        version=_VERSION,
         namespaces_loaded=len(manager.list_namespaces()),
     )
 
 @app.get("/v1/namespaces", tags=["meta"], dependencies=[Depends(verify_api_key)])
-def list_namespaces():
+async def list_namespaces():
     return {"namespaces": manager.list_namespaces()}
 
 
@@ -473,11 +578,7 @@ def _live_record_count(db) -> int:
 
 @app.get("/v1/namespaces/{namespace}/stats", response_model=NamespaceStats,
          tags=["meta"], dependencies=[Depends(verify_api_key)])
-def namespace_stats(namespace: str):
-    try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
+def namespace_stats(namespace: str, db=Depends(require_ns)):
     return NamespaceStats(
         namespace  = namespace,
         db_path    = f"{namespace}.feather",
@@ -505,7 +606,7 @@ def admin_overview():
     items.sort(key=lambda x: x["records"], reverse=True)
 
     return AdminOverview(
-        version       = feather_db.__version__,
+        version       = _VERSION,
         uptime        = int(time.time() - _PROCESS_START),
         dim           = int(os.getenv("FEATHER_DB_DIM", "768")),
         nsCount       = len(items),
@@ -584,125 +685,290 @@ async def upload_feather(
 # ─────────────────────────────────────────────
 # Routes — vector operations
 # ─────────────────────────────────────────────
-@app.post("/v1/{namespace}/vectors", status_code=201, tags=["vectors"],
-          dependencies=[Depends(verify_api_key)])
-def add_vector(namespace: str, req: AddVectorRequest):
-    db = manager.get(namespace)
-    meta = _meta_from_model(req.metadata) if req.metadata else Metadata()
-
-    # Reject a mismatch only against an *established* dim. On an empty namespace
-    # the first vector defines the dim (any dimension allowed), so we never
-    # coerce it to the server default.
-    ns_dim = _established_dim(db, req.modality)
-    if ns_dim and len(req.vector) != ns_dim:
-        raise HTTPException(
-            400,
-            f"vector dim {len(req.vector)} != index dim {ns_dim} "
-            f"for modality '{req.modality}'",
-        )
-
+async def _add_one(namespace: str, rec_id: int, vec, meta: Metadata, modality: str) -> dict:
     # Always stamp namespace_id from the URL namespace if not set in body
     if not meta.namespace_id:
         meta.namespace_id = namespace
 
-    with manager.lock(namespace):
-        db.add(id=req.id, vec=req.vector, meta=meta, modality=req.modality)
+    # Everything that touches the core — opening a new namespace, the dim check
+    # and the add — runs in the pool: each takes the DB's mutex, which a save or
+    # compact may hold for a while with the GIL released.
+    def _add():
+        handle = manager.handle(namespace)
+        # Reject a mismatch only against an *established* dim. On an empty
+        # namespace the first vector defines the dim (any dimension allowed),
+        # so we never coerce it to the server default.
+        ns_dim = _established_dim(handle.db, modality)
+        if ns_dim and len(vec) != ns_dim:
+            raise HTTPException(
+                400,
+                f"vector dim {len(vec)} != index dim {ns_dim} "
+                f"for modality '{modality}'",
+            )
+        with handle.lock.write():
+            handle.db.add(id=rec_id, vec=vec, meta=meta, modality=modality)
+    await _in_pool(_add)
+
+    return {"id": rec_id, "namespace": namespace, "modality": modality}
 
-    return {"id": req.id, "namespace": namespace, "modality": req.modality}
 
-
-@app.post("/v1/{namespace}/search", response_model=SearchResponse, tags=["search"],
+@app.post("/v1/{namespace}/vectors", status_code=201, tags=["vectors"],
           dependencies=[Depends(verify_api_key)])
-def search_vectors(namespace: str, req: SearchRequest):
+async def add_vector(namespace: str, req: AddVectorRequest):
+    meta = _meta_from_model(req.metadata) if req.metadata else Metadata()
+    return await _add_one(namespace, req.id, _request_vector(req), meta, req.modality)
+
+
+@app.post("/v1/{namespace}/vectors_bin", status_code=201, tags=["vectors"],
+          dependencies=[Depends(verify_api_key)],
+          openapi_extra={"requestBody": {"content": {
+              "application/octet-stream": {"schema": {"type": "string", "format": "binary"}},
+          }}})
+async def add_vector_bin(namespace: str, request: Request, modality: str = "text"):
+    """Add one vector without JSON: the body is the record id as a little-endian
+    uint64 followed by the vector as little-endian float32s (dim = remaining
+    bytes / 4). No metadata — set it afterwards with PUT /records/{id}."""
+    body = await request.body()
+    if len(body) <= 8 or (len(body) - 8) % 4:
+        raise HTTPException(400, "body must be a uint64 id followed by float32 values")
+    rec_id = int.from_bytes(body[:8], "little")
+    vec = np.frombuffer(body, dtype="<f4", offset=8)
+    meta = Metadata()
+    meta.timestamp = int(time.time())
+    return await _add_one(namespace, rec_id, vec, meta, modality)
+
+
+# Validates the optional metadata array of a vectors_bulk body in one call.
+_BULK_METAS = TypeAdapter(List[Optional[MetadataIn]])
+
+
+@app.post("/v1/{namespace}/vectors_bulk", status_code=201, tags=["vectors"],
+          dependencies=[Depends(verify_api_key)],
+          openapi_extra={"requestBody": {"content": {
+              "application/octet-stream": {"schema": {"type": "string", "format": "binary"}},
+          }}})
+async def add_vectors_bulk(namespace: str, request: Request, modality: str = "text"):
+    """Add N vectors in one request and one core add_batch call. Body, all
+    little-endian:
+
+        uint32 n, uint32 dim
+        n × dim float32          vectors, row-major
+        n × uint64               ids
+        [uint32 len, len bytes]  optional JSON array of n metadata objects (or nulls)
+
+    The vectors are passed to the core as a view of the request body — no
+    per-vector Python list or intermediate float32 copy."""
+    body = await request.body()
+    if len(body) < 8:
+        raise HTTPException(400, "body must start with uint32 n, uint32 dim")
+    n, dim = struct.unpack_from("<II", body)
+    vec_end = 8 + 4 * n * dim
+    ids_end = vec_end + 8 * n
+    if not n or not dim or len(body) < ids_end:
+        raise HTTPException(400, f"body too short for {n} x {dim} float32 vectors and {n} uint64 ids")
+    vecs = np.frombuffer(body, dtype="<f4", count=n * dim, offset=8).reshape(n, dim)
+    ids = np.frombuffer(body, dtype="<u8", count=n, offset=vec_end).tolist()
+
+    now = int(time.time())
+    metas: List[Metadata] = []
+    if len(body) > ids_end:
+        if len(body) < ids_end + 4:
+            raise HTTPException(400, "truncated metadata length prefix")
+        (meta_len,) = struct.unpack_from("<I", body, ids_end)
+        if len(body) != ids_end + 4 + meta_len:
+            raise HTTPException(400, "metadata length prefix does not match the body")
+        try:
+            metas_in = _BULK_METAS.validate_json(body[ids_end + 4:])
+        except ValidationError as e:
+            raise RequestValidationError(e.errors())
+        if len(metas_in) != n:
+            raise HTTPException(400, f"got {len(metas_in)} metadata entries for {n} vectors")
+        metas = [_meta_from_model(m_in) if m_in else Metadata() for m_in in metas_in]
+    else:
+        metas = [Metadata() for _ in range(n)]
+    for meta in metas:
+        if not meta.timestamp:
+            meta.timestamp = now
+        if not meta.namespace_id:
+            meta.namespace_id = namespace
+
+    def _add():
+        handle = manager.handle(namespace)
+        ns_dim = _established_dim(handle.db, modality)
+        if ns_dim and dim != ns_dim:
+            raise HTTPException(
+                400,
+                f"vector dim {dim} != index dim {ns_dim} for modality '{modality}'",
+            )
+        with handle.lock.write():
+            handle.db.add_batch(ids, vecs, metas, modality=modality)
+    await _in_pool(_add)
+
+    return {"inserted": n, "namespace": namespace, "modality": modality}
+
+
+@app.post("/v1/{namespace}/vectors_i8", status_code=201, tags=["vectors"],
+          dependencies=[Depends(verify_api_key)],
+          summary="Add a vector sent as int8 codes (wire format only)")
+async def add_vector_i8(namespace: str, req: AddVectorI8Request):
+    """Add one vector transmitted as int8 codes with a per-vector scale/offset.
+
+    This is a wire-format convenience only: the codes are dequantized here and
+    the vector is stored and searched as float32, exactly as if it had been
+    sent to POST /vectors. It shrinks the request body, not the index or the
+    search cost. (For int8 storage in memory, enable it on the modality in the
+    core with `set_int8_ram`.)"""
     try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
+        raw = base64.b64decode(req.vector_i8, validate=True)
+    except ValueError:
+        raise HTTPException(400, "vector_i8 is not valid base64")
+    if not raw:
+        raise HTTPException(400, "vector_i8 is empty")
+    vec = np.frombuffer(raw, dtype=np.int8).astype(np.float32)
+    vec *= np.float32(req.scale)
+    vec += np.float32(req.offset)
+    meta = _meta_from_model(req.metadata) if req.metadata else Metadata()
+    return await _add_one(namespace, req.id, vec, meta, req.modality)
 
+
+@app.post("/v1/{namespace}/search", response_model=SearchResponse, tags=["search"],
+          dependencies=[Depends(verify_api_key)])
+async def search_vectors(namespace: str, req: SearchRequest, db=Depends(require_ns)):
     sf = _build_filter(req)
     sc = _build_scoring(req)
-    _check_query_dim(db, req.vector, req.modality)
-
-    raw = db.search(req.vector, k=req.k, filter=sf, scoring=sc, modality=req.modality)
-
-    items = [
-        SearchResultItem(id=r.id, score=r.score, metadata=_meta_to_model(r.metadata))
-        for r in raw
-    ]
-    return SearchResponse(results=items, count=len(items))
+    vec = _request_vector(req)
+
+    def _search():
+        with manager.read_lock(namespace):
+            _check_query_dim(db, vec, req.modality)
+            return db.search_columnar(vec, k=req.k, filter=sf, scoring=sc, modality=req.modality)
+    cols = await _in_pool(_search)
+    rows = _columns_to_rows(cols)
+    return Response(pydantic_core.to_json({"results": rows, "count": len(rows)}),
+                    media_type="application/json")
+
+
+# Cap on queries per batch_search call (bounds response size and lock hold time).
+MAX_BATCH_QUERIES = int(os.getenv("FEATHER_MAX_BATCH_QUERIES", "1024"))
+
+
+def _check_batch_size(n: int):
+    """413 before any per-query work (filters, dim checks, array copies)."""
+    if n > MAX_BATCH_QUERIES:
+        raise HTTPException(413, f"too many queries ({n}); cap is {MAX_BATCH_QUERIES}")
+
+
+@app.post("/v1/{namespace}/batch_search", tags=["search"],
+          dependencies=[Depends(verify_api_key)],
+          openapi_extra={"requestBody": {"content": {
+              "application/json": {"schema": BatchSearchRequest.model_json_schema()},
+              "application/octet-stream": {"schema": {"type": "string", "format": "binary"}},
+          }}})
+async def batch_search(namespace: str, request: Request,
+                       k: int = 10, modality: str = "text", db=Depends(require_ns)):
+    """Run many vector searches in one round trip and one core call.
+
+    Body is either a JSON `BatchSearchRequest`, or `application/octet-stream`
+    holding the queries as raw little-endian float32, row-major (N × dim) —
+    with `k` / `modality` taken from the query string and no filters.
+
+    Streams NDJSON: one `{"results": [...], "count": n}` line per query, in
+    input order."""
+
+    body = await request.body()
+    sf = sc = None
+    if request.headers.get("content-type", "").startswith("application/octet-stream"):
+        if not 1 <= k <= 1000:
+            raise HTTPException(422, "k must be between 1 and 1000")
+        dim = await _in_pool(_established_dim, db, modality)
+        if not dim:
+            raise HTTPException(404, f"Modality '{modality}' has no index yet")
+        if not body or len(body) % (4 * dim):
+            raise HTTPException(400, f"body must be N x {dim} float32 values")
+        _check_batch_size(len(body) // (4 * dim))
+        queries = np.frombuffer(body, dtype="<f4").reshape(-1, dim)
+    else:
+        try:
+            req = BatchSearchRequest.model_validate_json(body)
+        except ValidationError as e:
+            raise RequestValidationError(e.errors())
+        _check_batch_size(len(req.vectors))
+        k, modality = req.k, req.modality
+        sf = _build_filter(req)
+        sc = _build_scoring(req)
+        if len({len(v) for v in req.vectors}) != 1:
+            raise HTTPException(400, "all query vectors must have the same dim")
+        queries = np.asarray(req.vectors, dtype=np.float32)
+
+    def _search():
+        with manager.read_lock(namespace):
+            _check_query_dim(db, queries[0], modality)
+            return db.batch_search(queries, k=k, filter=sf, scoring=sc, modality=modality)
+    batches = await _in_pool(_search)
+
+    def lines():
+        for raw in batches:
+            items = [
+                SearchResultItem(id=r.id, score=r.score, metadata=_meta_to_model(r.metadata))
+                for r in raw
+            ]
+            yield SearchResponse(results=items, count=len(items)).model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @app.get("/v1/{namespace}/records/{record_id}", response_model=MetadataOut,
          tags=["records"], dependencies=[Depends(verify_api_key)])
-def get_record(namespace: str, record_id: int):
-    try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
-
-    meta = db.get_metadata(record_id)
+async def get_record(namespace: str, record_id: int, db=Depends(require_ns)):
+    def _get():
+        with manager.read_lock(namespace):
+            return db.get_metadata(record_id)
+    meta = await _in_pool(_get)
     if meta is None:
         raise HTTPException(404, f"Record {record_id} not found in namespace '{namespace}'")
     if meta.source == "_forgotten" or meta.get_attribute("_deleted") == "true":
         raise HTTPException(404, f"Record {record_id} not found in namespace '{namespace}'")
-    return _meta_to_model(meta)
+    return _json_response(_meta_to_model(meta))
 
 
 @app.put("/v1/{namespace}/records/{record_id}", tags=["records"],
          dependencies=[Depends(verify_api_key)])
-def update_record_metadata(namespace: str, record_id: int, req: UpdateMetadataRequest):
-    try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
-
+def update_record_metadata(namespace: str, record_id: int, req: UpdateMetadataRequest,
+                           db=Depends(require_ns)):
     meta = _meta_from_model(req.metadata)
-    with manager.lock(namespace):
+    with manager.write_lock(namespace):
         db.update_metadata(record_id, meta)
     return {"id": record_id, "updated": True}
 
 
 @app.put("/v1/{namespace}/records/{record_id}/importance", tags=["records"],
          dependencies=[Depends(verify_api_key)])
-def update_importance(namespace: str, record_id: int, req: UpdateImportanceRequest):
-    try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
-
-    with manager.lock(namespace):
+def update_importance(namespace: str, record_id: int, req: UpdateImportanceRequest,
+                      db=Depends(require_ns)):
+    with manager.write_lock(namespace):
         db.update_importance(record_id, req.importance)
     return {"id": record_id, "importance": req.importance}
 
 
 @app.post("/v1/{namespace}/records/{record_id}/link", tags=["records"],
           dependencies=[Depends(verify_api_key)])
-def link_records(namespace: str, record_id: int, req: LinkRequest):
-    try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
-
-    with manager.lock(namespace):
+def link_records(namespace: str, record_id: int, req: LinkRequest,
+                 db=Depends(require_ns)):
+    with manager.write_lock(namespace):
         db.link(from_id=record_id, to_id=req.to_id)
     return {"from_id": record_id, "to_id": req.to_id, "linked": True}
 
 
 @app.delete("/v1/{namespace}/records/{record_id}", tags=["records"],
             dependencies=[Depends(verify_api_key)])
-def delete_record(namespace: str, record_id: int):
-    try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
-
+def delete_record(namespace: str, record_id: int, db=Depends(require_ns)):
     meta = db.get_metadata(record_id)
     if meta is None:
         raise HTTPException(404, f"Record {record_id} not found")
     if meta.source == "_forgotten" or meta.get_attribute("_deleted") == "true":
         raise HTTPException(404, f"Record {record_id} not found")
 
-    with manager.lock(namespace):
+    with manager.write_lock(namespace):
         db.forget(record_id)
         # Cascade: drop any edges pointing at this id so the graph isn't left
         # with dangling pointers to a deleted record. Set ?cascade=false to opt
@@ -714,7 +980,7 @@ def delete_record(namespace: str, record_id: int):
 
 @app.post("/v1/{namespace}/records/batch_delete", tags=["records"],
           dependencies=[Depends(verify_api_key)])
-def batch_delete(namespace: str, req: BatchDeleteRequest):
+def batch_delete(namespace: str, req: BatchDeleteRequest, db=Depends(require_ns)):
     """Delete many records in ONE pass: take the namespace lock once, forget
     every id, then save once.
 
@@ -725,10 +991,6 @@ def batch_delete(namespace: str, req: BatchDeleteRequest):
     Targets = `ids` ∪ (all records with `entity_id`). `cascade` (default off)
     prunes graph edges to the deleted ids in a single sweep.
     """
-    try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
 
     ids = set(int(i) for i in (req.ids or []))
     if req.entity_id:
@@ -743,7 +1005,7 @@ def batch_delete(namespace: str, req: BatchDeleteRequest):
 
     deleted = 0
     not_found = 0
-    with manager.lock(namespace):
+    with manager.write_lock(namespace):
         for rid in ids:
             meta = db.get_metadata(rid)
             if (meta is None or meta.source == "_forgotten"
@@ -763,14 +1025,10 @@ def batch_delete(namespace: str, req: BatchDeleteRequest):
 
 @app.delete("/v1/{namespace}/records/{from_id}/link/{to_id}", tags=["records"],
             dependencies=[Depends(verify_api_key)])
-def unlink_records(namespace: str, from_id: int, to_id: int):
+def unlink_records(namespace: str, from_id: int, to_id: int, db=Depends(require_ns)):
     """Remove a single edge from `from_id` to `to_id`. Returns the number of
     edges removed (0 if the edge didn't exist, 1+ if multiple rel_types matched).
     """
-    try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
     meta = db.get_metadata(from_id)
     if meta is None:
         raise HTTPException(404, f"Record {from_id} not found")
@@ -778,7 +1036,7 @@ def unlink_records(namespace: str, from_id: int, to_id: int):
     kept    = [e for e in current if e.target_id != to_id]
     removed = len(current) - len(kept)
     if removed > 0:
-        with manager.lock(namespace):
+        with manager.write_lock(namespace):
             meta.edges = kept
             db.update_metadata(from_id, meta)
             db.save()
@@ -787,16 +1045,12 @@ def unlink_records(namespace: str, from_id: int, to_id: int):
 
 @app.post("/v1/{namespace}/purge", tags=["records"],
           dependencies=[Depends(verify_api_key)])
-def purge_namespace(namespace: str, req: PurgeRequest):
+def purge_namespace(namespace: str, req: PurgeRequest, db=Depends(require_ns)):
     """Hard-delete all records whose metadata.namespace_id matches req.namespace_id.
     Removes from HNSW indices, metadata store, and reverse edge index. Returns count removed.
     """
-    try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
 
-    with manager.lock(namespace):
+    with manager.write_lock(namespace):
         removed = db.purge(req.namespace_id)
         db.save()
     return {"namespace": namespace, "namespace_id": req.namespace_id, "removed": removed}
@@ -804,19 +1058,16 @@ def purge_namespace(namespace: str, req: PurgeRequest):
 
 @app.post("/v1/{namespace}/compact", tags=["records"],
           dependencies=[Depends(verify_api_key)])
-def compact_namespace(namespace: str, prune_dead_edges: bool = True):
+def compact_namespace(namespace: str, prune_dead_edges: bool = True,
+                      db=Depends(require_ns)):
     """Rebuild HNSW indices, physically dropping any soft-deleted records.
     By default also sweeps every record's outgoing edges and drops those that
     point at a deleted / forgotten / missing record (set `?prune_dead_edges=false`
     to skip). Returns counts for both reclamations.
     """
-    try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
 
     edges_pruned = 0
-    with manager.lock(namespace):
+    with manager.write_lock(namespace):
         reclaimed = db.compact()
         if prune_dead_edges:
             edges_pruned = _prune_dead_edges(db)
@@ -827,13 +1078,9 @@ def compact_namespace(namespace: str, prune_dead_edges: bool = True):
 # ── Index maintenance / stats (Phase 7–8 capabilities) ──────────────
 @app.get("/v1/{namespace}/admin/index_stats", response_model=IndexStatsResponse,
          tags=["admin"], dependencies=[Depends(verify_api_key)])
-def index_stats(namespace: str):
+def index_stats(namespace: str, db=Depends(require_ns)):
     """Operational index health: record count, dim, on-disk quantization state,
     auto-compaction threshold, and the per-namespace secondary-index sizes."""
-    try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
     mns = [{"id": n, "size": db.namespace_size(n)} for n in db.list_namespaces()]
     mns.sort(key=lambda x: -x["size"])
     pm = _primary_modality(db)
@@ -853,28 +1100,20 @@ def index_stats(namespace: str):
 
 @app.put("/v1/{namespace}/admin/auto_compact", tags=["admin"],
          dependencies=[Depends(verify_api_key)])
-def set_auto_compact(namespace: str, req: AutoCompactRequest):
+def set_auto_compact(namespace: str, req: AutoCompactRequest, db=Depends(require_ns)):
     """Enable/adjust incremental auto-compaction (rebuild a modality once its
     deleted/total ratio crosses `ratio`). 0 disables."""
-    try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
-    with manager.lock(namespace):
+    with manager.write_lock(namespace):
         db.set_auto_compact(req.ratio)
     return {"namespace": namespace, "auto_compact_ratio": db.get_auto_compact()}
 
 
 @app.put("/v1/{namespace}/admin/quantize", tags=["admin"],
          dependencies=[Depends(verify_api_key)])
-def set_quantize(namespace: str, req: QuantizeRequest):
+def set_quantize(namespace: str, req: QuantizeRequest, db=Depends(require_ns)):
     """Toggle on-disk int8 quantization for a modality (~3x smaller .feather).
     Takes effect on save, which we do immediately so it's persisted now."""
-    try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
-    with manager.lock(namespace):
+    with manager.write_lock(namespace):
         db.set_quantized(req.modality, req.on)
         db.save()
     return {"namespace": namespace, "modality": req.modality,
@@ -883,13 +1122,10 @@ def set_quantize(namespace: str, req: QuantizeRequest):
 
 @app.get("/v1/{namespace}/records", tags=["records"],
          dependencies=[Depends(verify_api_key)])
-def list_records(namespace: str, limit: int = 50, after: int = -1, modality: str = "text"):
+def list_records(namespace: str, limit: int = 50, after: int = -1, modality: str = "text",
+                 db=Depends(require_ns)):
     """Cursor-based record listing. Returns up to `limit` records with id > `after`.
     Default after=-1 so a record with id 0 appears on the first page."""
-    try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
 
     # List by metadata id (not a single modality index) so records whose
     # vectors live under a non-"text" modality still show up.
@@ -919,29 +1155,19 @@ def list_records(namespace: str, limit: int = 50, after: int = -1, modality: str
 
 @app.post("/v1/{namespace}/keyword_search", response_model=SearchResponse, tags=["search"],
           dependencies=[Depends(verify_api_key)])
-def keyword_search(namespace: str, req: KeywordSearchRequest):
-    try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
-
+def keyword_search(namespace: str, req: KeywordSearchRequest, db=Depends(require_ns)):
     sf = _build_filter(req)
     raw = db.keyword_search(req.query, k=req.k, filter=sf)
     items = [
         SearchResultItem(id=r.id, score=r.score, metadata=_meta_to_model(r.metadata))
         for r in raw
     ]
-    return SearchResponse(results=items, count=len(items))
+    return _json_response(SearchResponse(results=items, count=len(items)))
 
 
 @app.post("/v1/{namespace}/hybrid_search", response_model=SearchResponse, tags=["search"],
           dependencies=[Depends(verify_api_key)])
-def hybrid_search(namespace: str, req: HybridSearchRequest):
-    try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
-
+def hybrid_search(namespace: str, req: HybridSearchRequest, db=Depends(require_ns)):
     sf = _build_filter(req)
     sc = _build_scoring(req)
     _check_query_dim(db, req.vector, req.modality)
@@ -952,7 +1178,7 @@ def hybrid_search(namespace: str, req: HybridSearchRequest):
         SearchResultItem(id=r.id, score=r.score, metadata=_meta_to_model(r.metadata))
         for r in raw
     ]
-    return SearchResponse(results=items, count=len(items))
+    return _json_response(SearchResponse(results=items, count=len(items)))
 
 
 @app.post("/v1/{namespace}/save", tags=["admin"], dependencies=[Depends(verify_api_key)])
@@ -964,6 +1190,16 @@ def save_namespace(namespace: str):
     return {"namespace": namespace, "saved": True}
 
 
+@app.post("/v1/admin/save_all", tags=["admin"], dependencies=[Depends(verify_api_key)])
+def save_all_namespaces():
+    """Flush every namespace to disk in one call — the saves run in parallel, so
+    this costs about the slowest namespace rather than the sum of all of them."""
+    results = manager.save_all()
+    failed = {ns: err for ns, err in results.items() if err is not None}
+    return {"saved": sorted(ns for ns, err in results.items() if err is None),
+            "failed": failed}
+
+
 # ─────────────────────────────────────────────
 # Bulk seeder — generates N records with random vectors
 # ─────────────────────────────────────────────
@@ -975,7 +1211,7 @@ def seed_namespace(namespace: str, req: SeedRequest):
     ns_tag = req.namespace_id or namespace
 
     inserted = []
-    with manager.lock(namespace):
+    with manager.write_lock(namespace):
         for i in range(req.count):
             # Cap random IDs at 2^53 - 1 so the dashboard (JavaScript) can address
             # them precisely. Larger IDs lose precision on round-trip and can't be
@@ -1003,11 +1239,7 @@ def seed_namespace(namespace: str, req: SeedRequest):
 @app.get("/v1/{namespace}/records/{record_id}/edges",
          response_model=EdgesResponse, tags=["graph"],
          dependencies=[Depends(verify_api_key)])
-def get_record_edges(namespace: str, record_id: int):
-    try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
+def get_record_edges(namespace: str, record_id: int, db=Depends(require_ns)):
     out = [EdgeOut(target_id=e.target_id, rel_type=e.rel_type, weight=e.weight)
            for e in db.get_edges(record_id)]
     inc = [IncomingEdgeOut(source_id=e.source_id, rel_type=e.rel_type, weight=e.weight)
@@ -1020,12 +1252,7 @@ def get_record_edges(namespace: str, record_id: int):
 # ─────────────────────────────────────────────
 @app.post("/v1/{namespace}/context_chain", response_model=ContextChainResponse,
           tags=["graph"], dependencies=[Depends(verify_api_key)])
-def context_chain(namespace: str, req: ContextChainRequest):
-    try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
-
+def context_chain(namespace: str, req: ContextChainRequest, db=Depends(require_ns)):
     if req.vector is not None:
         _check_query_dim(db, req.vector, req.modality)
         vec = np.asarray(req.vector, dtype=np.float32)
@@ -1053,12 +1280,8 @@ GRAPH_NODE_LIMIT = int(os.getenv("FEATHER_GRAPH_NODE_LIMIT", "4000"))
 
 @app.get("/v1/{namespace}/graph", tags=["graph"],
          dependencies=[Depends(verify_api_key)])
-def export_graph(namespace: str, ns_filter: str = "", entity_filter: str = ""):
-    try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
-
+def export_graph(namespace: str, ns_filter: str = "", entity_filter: str = "",
+                 db=Depends(require_ns)):
     # A browser force-graph can't render hundreds of thousands of nodes, and
     # serializing them all is pointless. If the namespace is large and the
     # caller didn't narrow it down, return a friendly guard instead of trying
@@ -1103,12 +1326,8 @@ def export_graph(namespace: str, ns_filter: str = "", entity_filter: str = ""):
 # ─────────────────────────────────────────────
 @app.get("/v1/{namespace}/schema", response_model=NamespaceSchema, tags=["meta"],
          dependencies=[Depends(verify_api_key)])
-def namespace_schema(namespace: str, sample_limit: int = 8):
+def namespace_schema(namespace: str, sample_limit: int = 8, db=Depends(require_ns)):
     """Walk live records, tally attributes + value samples + type inference."""
-    try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
 
     from collections import Counter, defaultdict
     attr_count: Counter = Counter()
@@ -1198,12 +1417,8 @@ def ops_timeseries(window: int = 3600, bucket_seconds: int = 60):
 
 @app.get("/v1/{namespace}/top_recalled", response_model=List[TopRecalledItem],
          tags=["meta"], dependencies=[Depends(verify_api_key)])
-def top_recalled(namespace: str, limit: int = 10):
+def top_recalled(namespace: str, limit: int = 10, db=Depends(require_ns)):
     """Records sorted by recall_count desc — what's actually being used."""
-    try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
     rows = []
     for record_id in db.get_all_ids(modality="text"):
         meta = db.get_metadata(record_id)
@@ -1311,7 +1526,7 @@ def ingest_text(namespace: str, req: IngestTextRequest):
     if not meta.timestamp:
         meta.timestamp = int(time.time())
 
-    with manager.lock(namespace):
+    with manager.write_lock(namespace):
         db.add(id=rec_id, vec=np.asarray(vec, dtype=np.float32),
                meta=meta, modality=req.modality)
         _throttled_save(namespace, db)   # WAL-durable; throttled full save
@@ -1415,7 +1630,7 @@ def bulk_import(namespace: str, req: ImportRequest):
         if entry["auto"]:
             embedded += 1
 
-    with manager.lock(namespace):
+    with manager.write_lock(namespace):
         if ids:
             db.add_batch(ids, np.asarray(vecs, dtype=np.float32), metas, modality=req.modality)
         # Throttled save instead of a full file rewrite per batch (WAL keeps the
@@ -1427,16 +1642,12 @@ def bulk_import(namespace: str, req: ImportRequest):
 
 @app.post("/v1/{namespace}/flush", tags=["records"],
           dependencies=[Depends(verify_api_key)])
-def flush_namespace(namespace: str):
+def flush_namespace(namespace: str, db=Depends(require_ns)):
     """Force a full save of the namespace now. Call this once after a bulk-import
     session (which uses throttled saves) to guarantee the .feather is fully
     written. Data is durable via the WAL even without it, but this compacts the
     WAL into the file and persists the HNSW graph."""
-    try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
-    with manager.lock(namespace):
+    with manager.write_lock(namespace):
         db.save()
         _last_save[namespace] = time.time()
     return {"namespace": namespace, "saved": True}
@@ -1444,14 +1655,10 @@ def flush_namespace(namespace: str):
 
 @app.get("/v1/{namespace}/hierarchy", response_model=HierarchyResponse,
          tags=["meta"], dependencies=[Depends(verify_api_key)])
-def namespace_hierarchy(namespace: str):
+def namespace_hierarchy(namespace: str, db=Depends(require_ns)):
     """Build a Brand → Channel → Campaign → AdSet → Ad → Creative tree
     from record metadata.attributes. Walks live records once, groups by levels.
     """
-    try:
-        db = manager.get(namespace, create=False)
-    except KeyError:
-        raise HTTPException(404, f"Namespace '{namespace}' not found")
 
     LEVELS = ["brand", "channel", "campaign", "adset", "ad", "creative"]
     counts: dict = {}    # tuple of values -> record_count
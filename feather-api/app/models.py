@@ -2,7 +2,7 @@
 Pydantic request / response models for Feather DB Cloud API.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import List, Optional, Dict, Any
 from enum import IntEnum
 
@@ -32,15 +32,39 @@ class MetadataOut(MetadataIn):
     links: List[int] = Field(default_factory=list)
 
 
-class AddVectorRequest(BaseModel):
+class _VectorPayload(BaseModel):
+    """`vector` as a JSON float list, or `vector_b64`: base64 of little-endian
+    float32 bytes — decoded with one np.frombuffer instead of validating every
+    element as a Python float. Exactly one must be set."""
+    vector: Optional[List[float]] = None
+    vector_b64: Optional[str] = None
+
+    @model_validator(mode="after")
+    def _one_vector(self):
+        if (self.vector is None) == (self.vector_b64 is None):
+            raise ValueError("provide exactly one of 'vector' or 'vector_b64'")
+        return self
+
+
+class AddVectorRequest(_VectorPayload):
     id: int
-    vector: List[float]
     metadata: Optional[MetadataIn] = None
     modality: str = "text"
 
 
-class SearchRequest(BaseModel):
-    vector: List[float]
+class AddVectorI8Request(BaseModel):
+    """A vector sent as int8 codes: `vector_i8` is base64 of int8 codes, decoded
+    as `code * scale + offset` — a quarter of the float32 payload. Wire format
+    only; the server stores the decoded float32 vector."""
+    id: int
+    vector_i8: str
+    scale: float = Field(..., gt=0)
+    offset: float = 0.0
+    metadata: Optional[MetadataIn] = None
+    modality: str = "text"
+
+
+class SearchRequest(_VectorPayload):
     k: int = Field(10, ge=1, le=1000)
     modality: str = "text"
     # Filters
@@ -59,6 +83,26 @@ class SearchRequest(BaseModel):
     scoring_min: Optional[float] = None
 
 
+class BatchSearchRequest(BaseModel):
+    vectors: List[List[float]] = Field(..., min_length=1)
+    k: int = Field(10, ge=1, le=1000)
+    modality: str = "text"
+    # Filters (applied to every query)
+    namespace_id: Optional[str] = None
+    entity_id: Optional[str] = None
+    attributes_match: Optional[Dict[str, str]] = None
+    source: Optional[str] = None
+    source_prefix: Optional[str] = None
+    importance_gte: Optional[float] = None
+    tags_contains: Optional[List[str]] = None
+    timestamp_after: Optional[int] = None
+    timestamp_before: Optional[int] = None
+    # Scoring
+    scoring_half_life: Optional[float] = None
+    scoring_weight: Optional[float] = None
+    scoring_min: Optional[float] = None
+
+
 class SearchResultItem(BaseModel):
     id: int
     score: float
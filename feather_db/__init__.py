@@ -3,7 +3,7 @@ from .core import (DB, ContextType, Metadata, ScoringConfig,
                    ContextNode, ContextEdge, ContextChainResult)
 from .filter import FilterBuilder
 from .domain_profiles import DomainProfile, MarketingProfile
-from .graph import visualize, export_graph, RelType
+from .graph import visualize, export_graph, auto_link_from_matrix, RelType
 
 # v0.6.0: Memory, Triggers, Episodes, Merge
 from .memory   import MemoryManager
@@ -35,7 +35,7 @@ __all__ = [
     "ContextNode", "ContextEdge", "ContextChainResult",
     "FilterBuilder",
     "DomainProfile", "MarketingProfile",
-    "visualize", "export_graph", "RelType",
+    "visualize", "export_graph", "auto_link_from_matrix", "RelType",
     # v0.6.0 memory layer
     "MemoryManager", "WatchManager", "ContradictionDetector",
     "EpisodeManager", "merge",
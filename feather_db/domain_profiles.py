@@ -31,9 +31,7 @@ class DomainProfile:
 
     def set_attr(self, key: str, value) -> "DomainProfile":
         """Store a domain-specific key-value pair. Value is coerced to str."""
-        attrs = self._meta.attributes
-        attrs[key] = str(value)
-        self._meta.attributes = attrs
+        self._meta.set_attribute(key, str(value))
         return self
 
     def get_attr(self, key: str, default=None):
@@ -46,12 +46,7 @@ class FilterBuilder:
         return self
 
     def attribute(self, key: str, value: str) -> "FilterBuilder":
-        current = self._filter.attributes_match
-        if current is None:
-            self._filter.attributes_match = {key: value}
-        else:
-            current[key] = value
-            self._filter.attributes_match = current
+        self._filter.add_attribute_match(key, value)
         return self
 
     def build(self):
@@ -12,10 +12,14 @@ Usage:
     # → open context_graph.html in any browser, no server needed
 """
 
+import functools
+import heapq
 import json
 import os
 from typing import Optional
 
+import numpy as np
+
 
 # ─────────────────────────────────────────────────────────────
 # Relationship type constants
@@ -35,13 +39,81 @@ class RelType:
 # ─────────────────────────────────────────────────────────────
 # Export
 # ─────────────────────────────────────────────────────────────
-def export_graph(db, namespace_filter: str = "", entity_filter: str = "") -> dict:
+def export_graph(db, namespace_filter: str = "", entity_filter: str = "",
+                 max_label_chars: int = 0, include_attributes: bool = True,
+                 min_edge_weight: float = 0.0, max_edges: int = 0) -> dict:
     """
     Export the context graph as a Python dict with 'nodes' and 'edges' lists.
     Compatible with D3.js, Cytoscape.js, vis.js, and NetworkX.
+
+    max_label_chars > 0 shortens node labels (the core already caps them at 60
+    bytes); include_attributes=False drops each node's 'attributes' dict.
+    Edges lighter than min_edge_weight are dropped, and max_edges > 0 keeps
+    only the heaviest max_edges of the rest (heaviest first).
     """
     raw = db.export_graph_json(namespace_filter, entity_filter)
-    return json.loads(raw)
+    graph = json.loads(raw)
+    if min_edge_weight > 0:
+        graph["edges"] = [e for e in graph["edges"] if e["weight"] >= min_edge_weight]
+    if 0 < max_edges < len(graph["edges"]):
+        graph["edges"] = heapq.nlargest(max_edges, graph["edges"], key=lambda e: e["weight"])
+    if max_label_chars > 0 or not include_attributes:
+        for n in graph["nodes"]:
+            if max_label_chars > 0:
+                n["label"] = n["label"][:max_label_chars]
+            if not include_attributes:
+                n.pop("attributes", None)
+    return graph
+
+
+# ─────────────────────────────────────────────────────────────
+# Auto-link from an in-memory embedding matrix
+# ─────────────────────────────────────────────────────────────
+def auto_link_from_matrix(db,
+                          ids,
+                          vecs,
+                          threshold: float = 0.80,
+                          rel_type: str = RelType.RELATED_TO,
+                          k: int = 15,
+                          block_rows: int = 2048) -> int:
+    """
+    Link each row of `vecs` to its top-k most similar rows whose cosine
+    similarity is >= threshold, in one bulk `db.link_many` call.
+
+    Use this when the caller already holds the embeddings as an (N x dim)
+    matrix — similarity is computed as blocked `vecs @ vecs.T` GEMMs (exact,
+    no per-record HNSW queries). Unlike `db.auto_link`, the edge weight is the
+    cosine similarity, not 1/(1+L2). `ids[i]` is the record id of `vecs[i]`.
+
+    Returns the number of edges created.
+    """
+    ids = np.asarray(ids, dtype=np.uint64)
+    emb = np.asarray(vecs, dtype=np.float32)
+    n = emb.shape[0]
+    if ids.shape[0] != n:
+        raise ValueError("auto_link_from_matrix: len(ids) != vecs.shape[0]")
+    k = min(k, n - 1)
+    if k <= 0:
+        return 0
+
+    norms = np.linalg.norm(emb, axis=1, keepdims=True)
+    emb = emb / np.where(norms > 0, norms, 1.0)
+
+    src, dst, w = [], [], []
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        sims = emb[start:stop] @ emb.T
+        rows = np.arange(stop - start)
+        sims[rows, rows + start] = -np.inf          # no self-links
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        top_sims = sims[rows[:, None], top]
+        r, c = np.nonzero(top_sims >= threshold)
+        src.append(ids[r + start])
+        dst.append(ids[top[r, c]])
+        w.append(top_sims[r, c])
+
+    return db.link_many(np.concatenate(src), np.concatenate(dst),
+                        rel_type, np.concatenate(w).astype(np.float32))
 
 
 # ─────────────────────────────────────────────────────────────
@@ -64,12 +136,14 @@ _HTML_TEMPLATE = r"""<!DOCTYPE html>
   #controls { display: flex; gap: 8px; margin-left: auto; align-items: center; }
   #controls input { background: #2d3748; border: 1px solid #4a5568; border-radius: 6px; color: #e2e8f0; padding: 4px 10px; font-size: 12px; width: 180px; }
   #controls input:focus { outline: none; border-color: #a78bfa; }
+  #controls input[type=range] { width: 110px; padding: 0; accent-color: #a78bfa; }
   #controls button { background: #2d3748; border: 1px solid #4a5568; border-radius: 6px; color: #e2e8f0; padding: 4px 12px; font-size: 12px; cursor: pointer; }
   #controls button:hover { background: #4a5568; }
 
   #main { display: flex; overflow: hidden; }
   #canvas-wrap { flex: 1; position: relative; overflow: hidden; background: #0f1117; height: 620px; min-height: 400px; }
   svg { width: 100%; height: 100%; display: block; background: #0f1117; }
+  #graph-canvas { display: block; background: #0f1117; }
 
   #sidebar { width: 280px; background: #1a1d27; border-left: 1px solid #2d3748; display: flex; flex-direction: column; overflow: hidden; flex-shrink: 0; }
   #sidebar-title { padding: 12px 14px; font-size: 12px; font-weight: 600; color: #94a3b8; text-transform: uppercase; letter-spacing: 0.8px; border-bottom: 1px solid #2d3748; }
@@ -119,6 +193,7 @@ _HTML_TEMPLATE = r"""<!DOCTYPE html>
   <span class="badge" id="stat-badge">0 nodes · 0 edges</span>
   <div id="controls">
     <input id="search-input" type="text" placeholder="Search nodes…">
+    <input id="weight-filter" type="range" min="0" max="1" step="0.05" value="0" title="Hide edges below this weight">
     <button id="btn-reset">Reset zoom</button>
     <button id="btn-auto">Auto-layout</button>
   </div>
@@ -184,11 +259,126 @@ document.getElementById("stat-badge").textContent =
   `${GRAPH_DATA.nodes.length} nodes · ${GRAPH_DATA.edges.length} edges`;
 
 // ── Build D3 force graph ──────────────────────────────────────────
-const svg = d3.select("#graph-svg");
 // Use window dimensions — clientWidth can be 0 if layout not yet painted
 const width  = window.innerWidth  - 280;  // subtract sidebar width
 const height = window.innerHeight - 50;   // subtract header height
 
+// The embedded data belongs to this page alone, so D3 works on the node
+// objects in place (it only adds x/y/vx/vy) rather than on spread copies.
+const nodes = GRAPH_DATA.nodes;
+// One pass over the nodes collects the id set and a lowercased search haystack
+// (built once instead of per keystroke). Haystack fields are newline-joined so
+// a query typed in the box never spans two.
+const nodeIdSet = new Set();
+for (const n of nodes) {
+  nodeIdSet.add(n.id);
+  n._hay = (n.id + "\n" + (n.label || "") + "\n" + (n.namespace_id || "") + "\n" +
+            (n.entity_id || "")).toLowerCase();
+}
+// Filter edges: drop any where source or target node is missing. Kept edges
+// get their own record because forceLink swaps source/target for node objects.
+// Stroke style and marker reference are resolved here, once per rel_type.
+const relStyle = new Map();
+const edges = [];
+for (const e of GRAPH_DATA.edges) {
+  if (!nodeIdSet.has(e.source) || !nodeIdSet.has(e.target)) continue;
+  let st = relStyle.get(e.rel_type);
+  if (!st) relStyle.set(e.rel_type, st = {
+    stroke: relColor(e.rel_type),
+    marker: "url(#arrow-" + e.rel_type.replace(/[^a-z0-9]/g, "_") + ")",
+  });
+  edges.push({ source: e.source, target: e.target, rel_type: e.rel_type, weight: e.weight,
+               _stroke: st.stroke, _markerId: st.marker,
+               _strokeWidth: Math.max(0.5, 0.5 + e.weight * 2) });
+}
+
+// Per-node edge lists, built once (the view is static) so the inspector costs
+// O(degree) per click instead of scanning every edge.
+const outAdj = new Map(), inAdj = new Map();
+for (const e of edges) {
+  (outAdj.get(e.source) || outAdj.set(e.source, []).get(e.source)).push(e);
+  (inAdj.get(e.target)  || inAdj.set(e.target, []).get(e.target)).push(e);
+}
+
+// Spread nodes initially so force sim converges faster
+const isLarge = nodes.length > 100;
+const spread  = isLarge ? Math.sqrt(nodes.length) * 60 : 200;
+// Vogel sunflower: fills the disk evenly and deterministically, so the charge
+// force starts from real spatial structure rather than a jittered ring.
+const goldenAngle = Math.PI * (3 - Math.sqrt(5));
+nodes.forEach((n, i) => {
+  const r = spread * Math.sqrt((i + 0.5) / nodes.length);
+  n.x = width / 2  + r * Math.cos(i * goldenAngle);
+  n.y = height / 2 + r * Math.sin(i * goldenAngle);
+});
+
+// Node size: importance × stickiness factor, computed once per node rather
+// than on every draw, hit test and label placement.
+for (const n of nodes) {
+  const sticky = 1 + Math.log1p(n.recall_count || 0);
+  n._r = Math.max(5, Math.min(20, 4 + n.importance * 7 * sticky * 0.4));
+}
+
+// Very large graphs: weaker, shorter-range charge and faster cooling so the
+// layout settles in ~150 ticks.
+const isHuge    = nodes.length > 2000;
+const linkDist  = isLarge ? 60  : 90;
+const charge    = isHuge ? -60 : isLarge ? -120 : -280;
+const alphaDecay = isHuge ? 0.06 : isLarge ? 0.04 : 0.0228;
+
+// Large graphs stop at a higher alpha: the last ticks before the default 0.001
+// move nothing visible but still cost a full redraw each.
+const simulation = d3.forceSimulation(nodes)
+  .alphaDecay(alphaDecay)
+  .alphaMin(isLarge ? 0.01 : 0.001)
+  .force("link",   d3.forceLink(edges).id(d => d.id).distance(linkDist).strength(0.3))
+  // Coarser Barnes–Hut approximation (theta) on large graphs: fewer quadtree
+  // cells visited per node on the costliest force.
+  .force("charge", d3.forceManyBody().strength(charge)
+    .theta(isLarge ? 1.4 : 0.9).distanceMin(2)
+    .distanceMax(isHuge ? 150 : isLarge ? 200 : 300))
+  .force("center", d3.forceCenter(width / 2, height / 2).strength(0.05))
+  .force("collide", d3.forceCollide().radius(d => d._r + 4));
+
+const tooltip = document.getElementById("tooltip");
+function showTooltip(d, x, y) {
+  tooltip.style.display = "block";
+  tooltip.innerHTML = `<div class="tt-label">${(d.label || "id:" + d.id).substring(0, 50)}</div>
+    <div class="tt-row">ns: ${d.namespace_id || "—"} · entity: ${d.entity_id || "—"}</div>
+    <div class="tt-row">importance: ${d.importance.toFixed(2)} · recalls: ${d.recall_count}</div>`;
+  moveTooltip(x, y);
+}
+function moveTooltip(x, y) {
+  tooltip.style.left = (x + 14) + "px";
+  tooltip.style.top  = (y - 10) + "px";
+}
+function showLinkTooltip(e, x, y) {
+  tooltip.style.display = "block";
+  tooltip.innerHTML = `<div class="tt-label">${e.rel_type.replace(/_/g, " ")}</div>
+    <div class="tt-row">${e.source.id} → ${e.target.id} · weight: ${e.weight.toFixed(2)}</div>`;
+  moveTooltip(x, y);
+}
+function hideTooltip() { tooltip.style.display = "none"; }
+
+function searchHit(d, q) { return d._hay.includes(q); }
+
+// Large graphs are drawn on one <canvas>: a tick is a single redraw instead of
+// O(nodes + edges) SVG attribute writes and the style/layout work they trigger.
+const useCanvas = nodes.length > 500;
+const svg = d3.select("#graph-svg");
+let renderer;
+
+// Hit-testing for both renderers: a quadtree over current positions (graph
+// coordinates), rebuilt lazily after ticks. One pointer listener and an
+// O(log N) lookup replace per-element hover/click registration.
+let qt = null;
+function pickAt(x, y) {
+  if (!qt) qt = d3.quadtree(nodes, d => d.x, d => d.y);
+  const d = qt.find(x, y, 20);
+  return d && Math.hypot(d.x - x, d.y - y) <= d._r + 2 ? d : null;
+}
+
+if (!useCanvas) {
 const g = svg.append("g");
 
 // Arrow markers per rel_type
@@ -206,101 +396,236 @@ usedRels.forEach(rel => {
     .attr("fill-opacity", 0.7);
 });
 
-// Deep-copy nodes for D3 (it mutates them)
-const nodes = GRAPH_DATA.nodes.map(n => ({ ...n }));
-// Filter edges: drop any where source or target node is missing
-const nodeIdSet = new Set(GRAPH_DATA.nodes.map(n => n.id));
-const edges = GRAPH_DATA.edges
-  .filter(e => nodeIdSet.has(e.source) && nodeIdSet.has(e.target))
-  .map(e => ({ ...e }));
-
-// Spread nodes initially so force sim converges faster
-const isLarge = nodes.length > 100;
-const spread  = isLarge ? Math.sqrt(nodes.length) * 60 : 200;
-nodes.forEach((n, i) => {
-  const angle = (i / nodes.length) * 2 * Math.PI;
-  n.x = width / 2  + spread * Math.cos(angle) * (0.5 + Math.random() * 0.5);
-  n.y = height / 2 + spread * Math.sin(angle) * (0.5 + Math.random() * 0.5);
-});
-
-// Node size: importance × stickiness factor
-function nodeRadius(n) {
-  const sticky = 1 + Math.log(1 + (n.recall_count || 0));
-  return Math.max(5, Math.min(20, 4 + n.importance * 7 * sticky * 0.4));
+// Links, plus their labels — drawn only when the graph is small; otherwise
+// the relation is shown on hover. Rebound when the edge-weight filter moves.
+const linkG  = g.append("g");
+const labelG = isLarge ? null : g.append("g");
+let link, linkLabel = null;
+function bindLinks(es) {
+  link = linkG.selectAll("line")
+    .data(es).join("line")
+    .attr("class", "link")
+    .attr("stroke", d => d._stroke)
+    .attr("stroke-width", d => d._strokeWidth)
+    .attr("stroke-opacity", isLarge ? 0.35 : 0.6)
+    .attr("marker-end", d => d._markerId);
+  if (labelG) linkLabel = labelG.selectAll("text")
+    .data(es).join("text")
+    .attr("class", "link-label")
+    .text(d => d.rel_type.replace(/_/g, " "));
+  if (isLarge)
+    link.on("mouseover", (event, d) => showLinkTooltip(d, event.offsetX, event.offsetY))
+      .on("mousemove", (event) => moveTooltip(event.offsetX, event.offsetY))
+      .on("mouseout", hideTooltip);
 }
-
-const linkDist  = isLarge ? 60  : 90;
-const charge    = isLarge ? -120 : -280;
-const alphaDecay = isLarge ? 0.04 : 0.0228;
-
-const simulation = d3.forceSimulation(nodes)
-  .alphaDecay(alphaDecay)
-  .force("link",   d3.forceLink(edges).id(d => d.id).distance(linkDist).strength(0.3))
-  .force("charge", d3.forceManyBody().strength(charge).distanceMax(300))
-  .force("center", d3.forceCenter(width / 2, height / 2).strength(0.05))
-  .force("collide", d3.forceCollide().radius(d => nodeRadius(d) + 4));
-
-// Links
-const link = g.append("g").selectAll("line")
-  .data(edges).join("line")
-  .attr("class", "link")
-  .attr("stroke", d => relColor(d.rel_type))
-  .attr("stroke-width", d => Math.max(0.5, 0.5 + d.weight * 2))
-  .attr("stroke-opacity", isLarge ? 0.35 : 0.6)
-  .attr("marker-end", d => `url(#arrow-${d.rel_type.replace(/[^a-z0-9]/g, "_")})`);
-
-// Link labels — only shown when graph is small or on hover
-const linkLabel = g.append("g").selectAll("text")
-  .data(isLarge ? [] : edges).join("text")
-  .attr("class", "link-label")
-  .text(d => d.rel_type.replace(/_/g, " "));
+bindLinks(edges);
 
 // Node groups
 const nodeG = g.append("g").selectAll("g")
   .data(nodes).join("g")
-  .attr("class", "node")
-  .call(d3.drag()
-    .on("start", (event, d) => { if (!event.active) simulation.alphaTarget(0.3).restart(); d.fx = d.x; d.fy = d.y; })
-    .on("drag",  (event, d) => { d.fx = event.x; d.fy = event.y; })
-    .on("end",   (event, d) => { if (!event.active) simulation.alphaTarget(0); d.fx = null; d.fy = null; }));
+  .attr("class", "node");
 
 nodeG.append("circle")
-  .attr("r", nodeRadius)
+  .attr("r", d => d._r)
   .attr("fill", d => NODE_COLORS[d.type] || "#60a5fa")
   .attr("stroke", d => d3.color(NODE_COLORS[d.type] || "#60a5fa").darker(0.8));
 
-nodeG.append("text")
-  .attr("dy", d => nodeRadius(d) + 11)
+// Large graphs label only their 50 most important nodes: the rest would be
+// unreadable at that density and double the DOM node count.
+const labelled = isLarge
+  ? new Set(nodes.slice().sort((a, b) => b.importance - a.importance).slice(0, 50))
+  : null;
+(labelled ? nodeG.filter(d => labelled.has(d)) : nodeG).append("text")
+  .attr("dy", d => d._r + 11)
   .text(d => (d.label || String(d.id)).substring(0, 20));
 
+// ── Zoom & pan ────────────────────────────────────────────────────
+let transform = d3.zoomIdentity;
+const zoom = d3.zoom().scaleExtent([0.05, 4])
+  .on("zoom", (event) => { transform = event.transform; g.attr("transform", transform); });
+const pick = (px, py) => pickAt(...transform.invert([px, py]));
+
+// Drag picks the node under the pointer; empty space falls through to zoom/pan.
+// d3-drag reports event.x/y relative to the subject (graph coordinates), so
+// the node follows the screen-space delta scaled back by the zoom instead.
+const drag = d3.drag()
+  .subject(event => pick(event.x, event.y))
+  .on("start", (event) => { if (!event.active) simulation.alphaTarget(0.3).restart(); const d = event.subject; d.fx = d.x; d.fy = d.y; hideTooltip(); })
+  .on("drag",  (event) => { const d = event.subject; d.fx += event.dx / transform.k; d.fy += event.dy / transform.k; })
+  .on("end",   (event) => { if (!event.active) simulation.alphaTarget(0); const d = event.subject; d.fx = null; d.fy = null; });
+svg.call(drag).call(zoom);
+
 // ── Tooltip ───────────────────────────────────────────────────────
-const tooltip = document.getElementById("tooltip");
-nodeG.on("mouseover", (event, d) => {
-  tooltip.style.display = "block";
-  tooltip.innerHTML = `<div class="tt-label">${(d.label || "id:" + d.id).substring(0, 50)}</div>
-    <div class="tt-row">ns: ${d.namespace_id || "—"} · entity: ${d.entity_id || "—"}</div>
-    <div class="tt-row">importance: ${d.importance.toFixed(2)} · recalls: ${d.recall_count}</div>`;
-  tooltip.style.left = (event.offsetX + 14) + "px";
-  tooltip.style.top  = (event.offsetY - 10) + "px";
-}).on("mousemove", (event) => {
-  tooltip.style.left = (event.offsetX + 14) + "px";
-  tooltip.style.top  = (event.offsetY - 10) + "px";
-}).on("mouseout", () => { tooltip.style.display = "none"; });
+// A link's own hover tooltip (large graphs) is left alone when no node is hit.
+svg.on("mousemove", (event) => {
+  const [x, y] = d3.pointer(event);
+  const d = pick(x, y);
+  if (d) showTooltip(d, x, y);
+  else if (!event.target.classList.contains("link")) hideTooltip();
+}).on("mouseleave", hideTooltip);
 
 // ── Node click → sidebar inspector ───────────────────────────────
-let selectedNode = null;
-nodeG.on("click", (event, d) => {
-  nodeG.classed("selected", false);
-  d3.select(event.currentTarget).classed("selected", true);
-  selectedNode = d.id;
-  renderDetail(d);
-  event.stopPropagation();
+svg.on("click", (event) => {
+  const d = pick(...d3.pointer(event));
+  nodeG.classed("selected", n => n === d);
+  selectedNode = d ? d.id : null;
+  if (d) renderDetail(d);
 });
-svg.on("click", () => { nodeG.classed("selected", false); selectedNode = null; });
+
+renderer = {
+  target: svg,
+  zoom,
+  search(q) {
+    nodeG.selectAll("circle").attr("opacity", d => (!q || searchHit(d, q)) ? 1 : 0.15);
+  },
+  setEdges(es) { bindLinks(es); this.tick(); },
+  // One pass per selection, writing every attribute of an element together,
+  // instead of one selection walk per .attr() call.
+  tick() {
+    qt = null;
+    link.each(function(d) {
+      this.setAttribute("x1", d.source.x); this.setAttribute("y1", d.source.y);
+      this.setAttribute("x2", d.target.x); this.setAttribute("y2", d.target.y);
+    });
+
+    if (linkLabel) linkLabel.each(function(d) {
+      this.setAttribute("x", (d.source.x + d.target.x) / 2);
+      this.setAttribute("y", (d.source.y + d.target.y) / 2 - 3);
+    });
+
+    nodeG.each(function(d) { this.setAttribute("transform", "translate(" + d.x + "," + d.y + ")"); });
+  },
+};
+} else {
+svg.style("display", "none");
+const wrap   = document.getElementById("canvas-wrap");
+const cw     = wrap.clientWidth  || width;
+const ch     = wrap.clientHeight || height;
+const dpr    = window.devicePixelRatio || 1;
+const canvas = document.createElement("canvas");
+canvas.id = "graph-canvas";
+canvas.width  = cw * dpr;
+canvas.height = ch * dpr;
+canvas.style.width  = cw + "px";
+canvas.style.height = ch + "px";
+wrap.insertBefore(canvas, tooltip);
+const ctx = canvas.getContext("2d");
+const sel = d3.select(canvas);
+let transform = d3.zoomIdentity;
+
+// Group once so each redraw changes stroke/fill state a handful of times
+// (per rel colour + width bucket, per node type) rather than per element.
+let edgeBatches;
+function batchEdges(list) {
+  edgeBatches = d3.groups(list, e => e._stroke + "|" + Math.round(e._strokeWidth * 2) / 2)
+    .map(([key, es]) => { const [color, w] = key.split("|"); return { color, width: +w, edges: es }; });
+}
+batchEdges(edges);
+const nodeBatches = d3.groups(nodes, d => d.type).map(([type, ns]) => {
+  const fill = NODE_COLORS[type] || "#60a5fa";
+  return { fill, stroke: d3.color(fill).darker(0.8).formatHex(), nodes: ns };
+});
+
+const pick = (px, py) => pickAt(...transform.invert([px, py]));
+
+let selected = null;
+function draw() {
+  ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+  ctx.clearRect(0, 0, cw, ch);
+  ctx.translate(transform.x, transform.y);
+  ctx.scale(transform.k, transform.k);
+
+  ctx.globalAlpha = 0.35;
+  for (const b of edgeBatches) {
+    ctx.beginPath();
+    for (const e of b.edges) { ctx.moveTo(e.source.x, e.source.y); ctx.lineTo(e.target.x, e.target.y); }
+    ctx.strokeStyle = b.color;
+    ctx.lineWidth = b.width;
+    ctx.stroke();
+  }
+
+  ctx.lineWidth = 2;
+  for (const dim of [true, false]) {
+    ctx.globalAlpha = dim ? 0.15 : 1;
+    for (const b of nodeBatches) {
+      ctx.beginPath();
+      for (const d of b.nodes) {
+        if (!!d._dim !== dim) continue;
+        const r = d._r;
+        ctx.moveTo(d.x + r, d.y);
+        ctx.arc(d.x, d.y, r, 0, 2 * Math.PI);
+      }
+      ctx.fillStyle = b.fill;
+      ctx.fill();
+      ctx.strokeStyle = b.stroke;
+      ctx.stroke();
+    }
+  }
+  ctx.globalAlpha = 1;
+  if (selected) {
+    ctx.beginPath();
+    ctx.arc(selected.x, selected.y, selected._r, 0, 2 * Math.PI);
+    ctx.strokeStyle = "#fff";
+    ctx.lineWidth = 3;
+    ctx.stroke();
+  }
+  // Labels only once zoomed in far enough to read them
+  if (transform.k >= 1.5) {
+    ctx.fillStyle = "#cbd5e1";
+    ctx.font = "9px 'Segoe UI', system-ui, sans-serif";
+    ctx.textAlign = "center";
+    for (const d of nodes)
+      ctx.fillText((d.label || String(d.id)).substring(0, 20), d.x, d.y + d._r + 11);
+  }
+}
+
+const zoom = d3.zoom().scaleExtent([0.05, 4])
+  .on("zoom", (event) => { transform = event.transform; draw(); });
+
+// Drag picks the node under the pointer; empty space falls through to zoom/pan.
+// d3-drag reports event.x/y relative to the subject (graph coordinates), so
+// the node follows the screen-space delta scaled back by the zoom instead.
+const drag = d3.drag()
+  .subject(event => pick(event.x, event.y))
+  .on("start", (event) => { if (!event.active) simulation.alphaTarget(0.3).restart(); const d = event.subject; d.fx = d.x; d.fy = d.y; hideTooltip(); })
+  .on("drag",  (event) => { const d = event.subject; d.fx += event.dx / transform.k; d.fy += event.dy / transform.k; })
+  .on("end",   (event) => { if (!event.active) simulation.alphaTarget(0); const d = event.subject; d.fx = null; d.fy = null; });
+sel.call(drag).call(zoom);
+
+sel.on("mousemove", (event) => {
+  const [x, y] = d3.pointer(event);
+  const d = pick(x, y);
+  canvas.style.cursor = d ? "pointer" : "default";
+  if (d) showTooltip(d, x, y); else hideTooltip();
+}).on("mouseleave", hideTooltip);
+
+sel.on("click", (event) => {
+  const d = pick(...d3.pointer(event));
+  selected = d;
+  selectedNode = d ? d.id : null;
+  if (d) renderDetail(d);
+  draw();
+});
+
+renderer = {
+  target: sel,
+  zoom,
+  search(q) {
+    for (const d of nodes) d._dim = !!q && !searchHit(d, q);
+    draw();
+  },
+  setEdges(es) { batchEdges(es); draw(); },
+  tick() { qt = null; draw(); },
+};
+}
+
+// ── Node click → sidebar inspector ───────────────────────────────
+let selectedNode = null;
 
 function renderDetail(d) {
-  const outEdges = edges.filter(e => (e.source.id || e.source) === d.id);
-  const inEdges  = edges.filter(e => (e.target.id || e.target) === d.id);
+
+  const outEdges = outAdj.get(d.id) || [];
+  const inEdges  = inAdj.get(d.id)  || [];
 
   const attrs = Object.entries(d.attributes || {})
     .map(([k, v]) => `<div class="kv-pair"><span class="kv-key">${k}</span><span class="kv-val">${v}</span></div>`)
@@ -332,23 +657,31 @@ function renderDetail(d) {
 }
 
 // ── Search highlight ──────────────────────────────────────────────
+// On very large graphs keystrokes are coalesced to one update per frame.
+let searchFrame = 0;
 document.getElementById("search-input").addEventListener("input", function() {
-  const q = this.value.toLowerCase();
-  nodeG.selectAll("circle").attr("opacity", d => {
-    if (!q) return 1;
-    const hit = String(d.id).includes(q) || (d.label || "").toLowerCase().includes(q) ||
-                (d.namespace_id || "").toLowerCase().includes(q) ||
-                (d.entity_id || "").toLowerCase().includes(q);
-    return hit ? 1 : 0.15;
-  });
+  if (nodes.length <= 10000) { renderer.search(this.value.toLowerCase()); return; }
+  cancelAnimationFrame(searchFrame);
+  searchFrame = requestAnimationFrame(() => renderer.search(this.value.toLowerCase()));
+});
+
+// ── Edge weight filter ────────────────────────────────────────────
+// Hidden edges leave the link force too, so the layout relaxes around what is
+// still shown. The inspector keeps listing every edge of a node.
+const weightInput = document.getElementById("weight-filter");
+weightInput.max = Math.max(1, d3.max(edges, e => e.weight) || 0);
+weightInput.addEventListener("input", function() {
+  const minW = +this.value;
+  const shown = minW > 0 ? edges.filter(e => e.weight >= minW) : edges;
+  simulation.force("link").links(shown);
+  renderer.setEdges(shown);
+  simulation.alpha(0.3).restart();
 });
 
 // ── Zoom & pan ────────────────────────────────────────────────────
-const zoom = d3.zoom().scaleExtent([0.05, 4])
-  .on("zoom", (event) => g.attr("transform", event.transform));
-svg.call(zoom);
 document.getElementById("btn-reset").onclick = () =>
-  svg.transition().duration(500).call(zoom.transform, d3.zoomIdentity.translate(width/2, height/2).scale(0.8));
+  renderer.target.transition().duration(500)
+    .call(renderer.zoom.transform, d3.zoomIdentity.translate(width/2, height/2).scale(0.8));
 document.getElementById("btn-auto").onclick = () => {
   simulation.alpha(0.5).restart();
 };
@@ -361,29 +694,70 @@ window.addEventListener("resize", () => {
 });
 
 // ── Simulation tick ───────────────────────────────────────────────
-simulation.on("tick", () => {
-  link
-    .attr("x1", d => d.source.x).attr("y1", d => d.source.y)
-    .attr("x2", d => d.target.x).attr("y2", d => d.target.y);
-
-  linkLabel
-    .attr("x", d => ((d.source.x + d.target.x) / 2))
-    .attr("y", d => ((d.source.y + d.target.y) / 2) - 3);
-
-  nodeG.attr("transform", d => `translate(${d.x},${d.y})`);
-});
+simulation.on("tick", renderer.tick);
+
+// Large graphs: run the layout headlessly first (simulation.tick() fires no
+// events, so nothing is drawn) and paint once it has settled, rather than
+// rendering every intermediate frame. The simulation stops by itself at
+// alphaMin; drag and "Auto-layout" restart it.
+if (isLarge) {
+  simulation.stop();
+  for (let i = 0; i < 300 && simulation.alpha() > simulation.alphaMin(); i++) simulation.tick();
+  renderer.tick();
+  if (simulation.alpha() > simulation.alphaMin()) simulation.restart();
+}
 
 }); // end window.load
 </script>
 </body>
 </html>"""
 
+# The template split once at import around its two slots and pre-encoded;
+# visualize() writes the pieces straight to a binary file instead of copying
+# the whole page (D3 + graph JSON) through str.replace calls and a text-mode
+# encoder.
+_HTML_HEAD, _html_rest = _HTML_TEMPLATE.split("<script>__D3_INLINE__</script>")
+_HTML_MID, _HTML_TAIL = _html_rest.split("__GRAPH_DATA__")
+_HTML_HEAD, _HTML_MID, _HTML_TAIL = (p.encode("utf-8") for p in (_HTML_HEAD, _HTML_MID, _HTML_TAIL))
+del _html_rest
+
+
+_D3_CDN_TAG = b'<script src="https://cdnjs.cloudflare.com/ajax/libs/d3/7.9.0/d3.min.js"></script>'
+
+
+# Bundled D3 first, then a copy a previous run may have fetched.
+_D3_PATHS = (os.path.join(os.path.dirname(__file__), "d3.min.js"), "/tmp/d3.min.js")
+
+
+@functools.lru_cache(maxsize=None)
+def _inline_d3_tag(path: str) -> bytes:
+    """<script> element inlining the D3 file at `path`, read once per process."""
+    with open(path, "rb") as f:
+        return b"<script>" + f.read() + b"</script>"
+
+
+def _d3_script_tag() -> bytes:
+    """The <script> element carrying D3 (UTF-8 encoded).
+
+    D3 is inlined from the bundled d3.min.js so the HTML works offline (no CDN
+    dependency); falls back to the CDN if the file can't be found. Only a
+    successful read is cached, so a file that appears later is still used."""
+    for p in _D3_PATHS:
+        if os.path.exists(p):
+            return _inline_d3_tag(p)
+    return _D3_CDN_TAG
+
 
 def visualize(db,
               output_path: str = "feather_graph.html",
               namespace_filter: str = "",
               entity_filter: str = "",
-              title: str = "Feather DB — Context Graph") -> str:
+              title: str = "Feather DB — Context Graph",
+              inline_d3: bool = True,
+              max_label_chars: int = 0,
+              include_attributes: bool = True,
+              min_edge_weight: float = 0.0,
+              max_edges: int = 0) -> str:
     """
     Generate a self-contained HTML file with an interactive D3 force graph.
 
@@ -393,44 +767,47 @@ def visualize(db,
         namespace_filter: Only include records from this namespace (empty = all)
         entity_filter:    Only include records from this entity (empty = all)
         title:            Page title
+        inline_d3:        Embed D3 (~280KB) so the page works offline. False
+                          loads it from the CDN instead — much smaller files,
+                          and the browser caches D3 across exported pages.
+        max_label_chars:  Shorten node labels before embedding (0 = keep the
+                          core's 60-byte labels).
+        include_attributes: False leaves node attributes out of the page —
+                          megabytes saved on large graphs, at the cost of the
+                          inspector's Attributes row.
+        min_edge_weight:  Leave out edges lighter than this.
+        max_edges:        Keep only the heaviest edges (0 = all). Layout and
+                          drawing cost scale with edge count, so this is the
+                          main lever for very dense graphs; the page also has
+                          a slider to hide light edges interactively.
 
     Returns:
         Absolute path to the generated HTML file.
     """
-    graph_data = export_graph(db, namespace_filter, entity_filter)
-    data_json  = json.dumps(graph_data, separators=(",", ":"))
-    # Escape </script> so it can't prematurely close the inline script block
-    data_json  = data_json.replace("</", "<\\/")
-
-    # Inline D3 so the HTML works offline (no CDN dependency)
-    _d3_paths = [
-        os.path.join(os.path.dirname(__file__), "d3.min.js"),
-        "/tmp/d3.min.js",
-    ]
-    d3_src = None
-    for p in _d3_paths:
-        if os.path.exists(p):
-            with open(p, encoding="utf-8") as _f:
-                d3_src = _f.read()
-            break
-    if d3_src is None:
-        # fallback to CDN
-        d3_src = ""  # will be replaced with CDN tag below
-        _html = _HTML_TEMPLATE.replace(
-            "<script>__D3_INLINE__</script>",
-            '<script src="https://cdnjs.cloudflare.com/ajax/libs/d3/7.9.0/d3.min.js"></script>'
-        )
+    # The core already returns compact JSON — embed it as-is instead of a
+    # json.loads + json.dumps round trip over the whole graph, unless labels,
+    # attributes or edges have to be trimmed first.
+    if max_label_chars > 0 or not include_attributes or min_edge_weight > 0 or max_edges > 0:
+        graph = export_graph(db, namespace_filter, entity_filter, max_label_chars,
+                             include_attributes, min_edge_weight, max_edges)
+        raw = json.dumps(graph, separators=(",", ":"), ensure_ascii=False)
+        node_count, edge_count = len(graph["nodes"]), len(graph["edges"])
     else:
-        _html = _HTML_TEMPLATE.replace("__D3_INLINE__", d3_src)
-
-    html = _html.replace("__GRAPH_DATA__", data_json)
+        raw = db.export_graph_json(namespace_filter, entity_filter)
+        # Exact without parsing: every node carries exactly one attributes
+        # object, and quotes inside string values are always escaped, so these
+        # markers can't be forged by content (an attribute named "source"
+        # could, hence counting edges only past the nodes array).
+        node_count = raw.count('"attributes":{')
+        edge_count = raw.partition('],"edges":[')[2].count('{"source":')
+    # Escape </script> so it can't prematurely close the inline script block
+    data = raw.replace("</", "<\\/").encode("utf-8")
 
     abs_path = os.path.abspath(output_path)
-    with open(abs_path, "w", encoding="utf-8") as f:
-        f.write(html)
+    with open(abs_path, "wb") as f:
+        f.writelines((_HTML_HEAD, _d3_script_tag() if inline_d3 else _D3_CDN_TAG,
+                      _HTML_MID, data, _HTML_TAIL))
 
-    node_count = len(graph_data["nodes"])
-    edge_count = len(graph_data["edges"])
     print(f"[feather_db] Context graph exported → {abs_path}")
     print(f"             {node_count} nodes  ·  {edge_count} edges")
     return abs_path
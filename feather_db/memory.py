@@ -29,6 +29,14 @@ _DEFAULT_HALF_LIFE  = 30.0   # days
 _DEFAULT_TIME_WT    = 0.3
 
 
+def _unit_rows(m: np.ndarray) -> np.ndarray:
+    """Row-wise L2-normalized float32 copy of `m`; all-zero rows stay zero, so
+    a dot product of two rows is their cosine similarity (0 for zero vectors)."""
+    m = np.asarray(m, dtype=np.float32)
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    return np.divide(m, norms, out=np.zeros_like(m), where=norms > 0)
+
+
 class MemoryManager:
     """
     Stateless helper for living-context memory operations.
@@ -196,42 +204,36 @@ class MemoryManager:
             if len(v) > 0:
                 vecs[r.id] = np.array(v, dtype=np.float32)
 
-        q = np.array(query_vec, dtype=np.float32)
-
-        selected: list = []
-        selected_vecs: list[np.ndarray] = []
+        # Normalize every candidate vector once; the max similarity of each
+        # candidate to the selected set is then updated with one mat-vec per pick
+        # instead of recomputing every pair (and its norms) each round.
         remaining = list(candidates)
+        has_vec = np.array([r.id in vecs for r in remaining])
+        dim = len(next(iter(vecs.values()))) if vecs else 0
+        unit = _unit_rows([vecs[r.id] if r.id in vecs else np.zeros(dim, np.float32)
+                           for r in remaining]) if dim else None
+        sim_q = np.array([r.score for r in remaining], dtype=np.float64)
+        sim_sel = np.zeros(len(remaining))     # max sim to selected (0 until one has a vector)
+        any_sel = False
 
+        selected: list = []
         while remaining and len(selected) < k:
-            best_idx  = -1
-            best_score = -1e9
-
-            for i, r in enumerate(remaining):
-                sim_q = r.score  # already computed by db.search
-
-                # Max similarity to already-selected nodes
-                if selected_vecs and r.id in vecs:
-                    rv = vecs[r.id]
-                    sim_sel = max(
-                        float(np.dot(rv, sv) / (np.linalg.norm(rv) * np.linalg.norm(sv) + 1e-9))
-                        for sv in selected_vecs
-                    )
-                else:
-                    sim_sel = 0.0
-
-                mmr = (1.0 - diversity) * sim_q - diversity * sim_sel
-
-                if mmr > best_score:
-                    best_score = mmr
-                    best_idx   = i
-
-            if best_idx == -1:
+            mmr = (1.0 - diversity) * sim_q - diversity * sim_sel
+            best_idx = int(np.argmax(mmr))
+            if mmr[best_idx] <= -1e9:
                 break
 
             chosen = remaining.pop(best_idx)
             selected.append(chosen)
-            if chosen.id in vecs:
-                selected_vecs.append(vecs[chosen.id])
+            if has_vec[best_idx]:
+                sims = (unit @ unit[best_idx]).astype(np.float64)
+                sim_sel = sims if not any_sel else np.maximum(sim_sel, sims)
+                sim_sel[~has_vec] = 0.0
+                any_sel = True
+            keep = np.arange(len(sim_q)) != best_idx
+            sim_q, sim_sel, has_vec = sim_q[keep], sim_sel[keep], has_vec[keep]
+            if unit is not None:
+                unit = unit[keep]
 
         return selected
 
@@ -362,12 +364,16 @@ class MemoryManager:
             if pa != pb:
                 parent[pa] = pb
 
-        for i in range(n):
-            for j in range(i + 1, n):
-                vi, vj = candidates[i][1], candidates[j][1]
-                cos = float(np.dot(vi, vj) / (np.linalg.norm(vi) * np.linalg.norm(vj) + 1e-9))
-                if cos >= similarity_threshold:
-                    union(i, j)
+        # Cosine similarity of all pairs as normalized mat-muls, a block of rows
+        # at a time (bounded memory); only pairs j > i above threshold are unioned.
+        unit = _unit_rows(np.stack([c[1] for c in candidates]))
+        block = 1024
+        for i0 in range(0, n, block):
+            sims = unit[i0:i0 + block] @ unit.T
+            for bi, j in zip(*np.nonzero(sims >= similarity_threshold)):
+                i = i0 + int(bi)
+                if j > i:
+                    union(i, int(j))
 
         # Group by cluster root
         clusters: dict[int, list[int]] = {}
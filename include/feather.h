@@ -487,6 +487,43 @@ private:
         }
     }
 
+    // ── Importance update (no lock) ──────────────────────────────────
+    void update_importance_nolock(uint64_t id, float importance) {
+        // WAL
+        {
+            std::ostringstream ws;
+            ws.write(reinterpret_cast<const char*>(&importance), 4);
+            wal_append(WalOp::UIMP, id, ws.str());
+        }
+        auto it = metadata_store_.find(id);
+        if (it != metadata_store_.end()) it->second.importance = importance;
+    }
+
+    // ── Link (no lock) — returns true if a new edge was created ──────
+    bool link_nolock(uint64_t from_id, uint64_t to_id,
+                     const std::string& rel_type, float weight) {
+        auto it = metadata_store_.find(from_id);
+        if (it == metadata_store_.end()) return false;
+
+        for (const auto& e : it->second.edges)
+            if (e.target_id == to_id && e.rel_type == rel_type) return false;
+
+        // WAL
+        {
+            std::ostringstream ws;
+            ws.write(reinterpret_cast<const char*>(&to_id), 8);
+            auto rel_len = static_cast<uint8_t>(std::min(rel_type.size(), size_t(255)));
+            ws.write(reinterpret_cast<const char*>(&rel_len), 1);
+            ws.write(rel_type.data(), rel_len);
+            ws.write(reinterpret_cast<const char*>(&weight), 4);
+            wal_append(WalOp::LINK, from_id, ws.str());
+        }
+
+        it->second.edges.push_back({to_id, rel_type, weight});
+        reverse_index_[to_id].push_back({from_id, rel_type, weight});
+        return true;
+    }
+
     // ── WAL helpers ──────────────────────────────────────────────────
     void wal_append(WalOp op, uint64_t id, const std::string& payload) {
         if (wal_path_.empty()) return;
@@ -583,6 +620,13 @@ private:
         rebuild_bm25_index();
     }
 
+    // First <= n bytes of s, cut back so a multi-byte UTF-8 sequence is never split.
+    static std::string utf8_prefix(const std::string& s, size_t n) {
+        if (s.size() <= n) return s;
+        while (n > 0 && (static_cast<unsigned char>(s[n]) & 0xC0) == 0x80) --n;
+        return s.substr(0, n);
+    }
+
     static std::string escape_json(const std::string& s) {
         std::string out;
         out.reserve(s.size() + 4);
@@ -942,6 +986,12 @@ public:
         touch_nolock(id);
     }
 
+    // Bulk touch(): one lock acquisition; an id listed k times is touched k times.
+    void touch_many(const std::vector<uint64_t>& ids) {
+        std::lock_guard<std::mutex> lock(mutex_);
+        for (uint64_t id : ids) touch_nolock(id);
+    }
+
     // ─────────────────────────────────────────────────────────────────
     // Graph: link
     // ─────────────────────────────────────────────────────────────────
@@ -949,25 +999,29 @@ public:
               const std::string& rel_type = "related_to",
               float weight = 1.0f) {
         std::lock_guard<std::mutex> lock(mutex_);
-        auto it = metadata_store_.find(from_id);
-        if (it == metadata_store_.end()) return;
-
-        for (const auto& e : it->second.edges)
-            if (e.target_id == to_id && e.rel_type == rel_type) return;
-
-        // WAL
-        {
-            std::ostringstream ws;
-            ws.write(reinterpret_cast<const char*>(&to_id), 8);
-            auto rel_len = static_cast<uint8_t>(std::min(rel_type.size(), size_t(255)));
-            ws.write(reinterpret_cast<const char*>(&rel_len), 1);
-            ws.write(rel_type.data(), rel_len);
-            ws.write(reinterpret_cast<const char*>(&weight), 4);
-            wal_append(WalOp::LINK, from_id, ws.str());
-        }
+        link_nolock(from_id, to_id, rel_type, weight);
+    }
 
-        it->second.edges.push_back({to_id, rel_type, weight});
-        reverse_index_[to_id].push_back({from_id, rel_type, weight});
+    // Bulk link: one lock acquisition for N edges. Same per-edge semantics as
+    // link() (unknown source skipped, (target, rel_type) deduplicated).
+    // `weights` may be empty (1.0 for all) or must match from_ids.size().
+    // Returns the number of edges actually created.
+    size_t link_many(const std::vector<uint64_t>& from_ids,
+                     const std::vector<uint64_t>& to_ids,
+                     const std::string& rel_type,
+                     const std::vector<float>& weights) {
+        std::lock_guard<std::mutex> lock(mutex_);
+        const size_t n = from_ids.size();
+        if (to_ids.size() != n)
+            throw std::runtime_error("link_many: from_ids and to_ids size mismatch");
+        if (!weights.empty() && weights.size() != n)
+            throw std::runtime_error("link_many: weights size mismatch");
+        size_t created = 0;
+        for (size_t i = 0; i < n; ++i)
+            if (link_nolock(from_ids[i], to_ids[i], rel_type,
+                            weights.empty() ? 1.0f : weights[i]))
+                ++created;
+        return created;
     }
 
     // ─────────────────────────────────────────────────────────────────
@@ -1163,7 +1217,7 @@ public:
             if (!first) oss << ","; first = false;
 
             oss << "{\"id\":"         << id;
-            oss << ",\"label\":\""    << escape_json(meta.content.substr(0, 60)) << "\"";
+            oss << ",\"label\":\""    << escape_json(utf8_prefix(meta.content, 60)) << "\"";
             oss << ",\"namespace_id\":\"" << escape_json(meta.namespace_id)      << "\"";
             oss << ",\"entity_id\":\"" << escape_json(meta.entity_id)            << "\"";
             oss << ",\"type\":"       << static_cast<int>(meta.type);
@@ -1243,14 +1297,17 @@ public:
 
     void update_importance(uint64_t id, float importance) {
         std::lock_guard<std::mutex> lock(mutex_);
-        // WAL
-        {
-            std::ostringstream ws;
-            ws.write(reinterpret_cast<const char*>(&importance), 4);
-            wal_append(WalOp::UIMP, id, ws.str());
-        }
-        auto it = metadata_store_.find(id);
-        if (it != metadata_store_.end()) it->second.importance = importance;
+        update_importance_nolock(id, importance);
+    }
+
+    // Bulk update_importance(): one lock acquisition for N records.
+    void update_importance_many(const std::vector<uint64_t>& ids,
+                                const std::vector<float>& importances) {
+        std::lock_guard<std::mutex> lock(mutex_);
+        if (importances.size() != ids.size())
+            throw std::runtime_error("update_importance_many: ids and importances size mismatch");
+        for (size_t i = 0; i < ids.size(); ++i)
+            update_importance_nolock(ids[i], importances[i]);
     }
 
     // Get raw vector for a given id and modality (empty if not found)
@@ -1357,6 +1414,38 @@ public:
                                      const ScoringConfig*  scoring = nullptr,
                                      const std::string&    modality = "text") {
         std::lock_guard<std::mutex> lock(mutex_);
+        return search_nolock(q, k, filter, scoring, modality);
+    }
+
+    // Many queries under one lock acquisition. `queries` is row-major
+    // (n_queries × dim); result i is exactly what search() would return for
+    // row i, with queries run in order (so recall touches from earlier rows
+    // are visible to later ones, as with sequential calls).
+    std::vector<std::vector<SearchResult>> batch_search(
+            const float* queries, size_t n_queries, size_t dim, size_t k = 5,
+            const SearchFilter*  filter  = nullptr,
+            const ScoringConfig* scoring = nullptr,
+            const std::string&   modality = "text") {
+        std::lock_guard<std::mutex> lock(mutex_);
+        auto m_it = modality_indices_.find(modality);
+        if (m_it != modality_indices_.end() && m_it->second.dim != dim)
+            throw std::runtime_error("batch_search: query dim " + std::to_string(dim) +
+                                     " != index dim " + std::to_string(m_it->second.dim));
+        std::vector<std::vector<SearchResult>> out;
+        out.reserve(n_queries);
+        std::vector<float> q(dim);
+        for (size_t i = 0; i < n_queries; ++i) {
+            std::copy(queries + i * dim, queries + (i + 1) * dim, q.begin());
+            out.push_back(search_nolock(q, k, filter, scoring, modality));
+        }
+        return out;
+    }
+
+private:
+    std::vector<SearchResult> search_nolock(const std::vector<float>& q, size_t k,
+                                            const SearchFilter*  filter,
+                                            const ScoringConfig* scoring,
+                                            const std::string&   modality) {
         auto m_it = modality_indices_.find(modality);
         if (m_it == modality_indices_.end()) return {};
         auto& m_idx = m_it->second;
@@ -1442,6 +1531,7 @@ public:
         return results;
     }
 
+public:
     // ─────────────────────────────────────────────────────────────────
     // BM25 keyword search
     // ─────────────────────────────────────────────────────────────────
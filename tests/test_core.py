@@ -41,6 +41,27 @@ class TestAddAndSearch:
         results = db.search(EMBED("a"), k=100)
         assert len(results) == 1  # only 1 record exists
 
+    def test_batch_search_matches_search(self, populated_db):
+        queries = np.stack([EMBED("deploy"), EMBED("onboarding")])
+        batched = populated_db.batch_search(queries, k=3)
+        assert len(batched) == 2
+        for q, rs in zip(queries, batched):
+            single = populated_db.search(q, k=3)
+            assert [r.id for r in rs] == [r.id for r in single]
+
+    def test_search_columnar_matches_search(self, populated_db):
+        q = EMBED("deploy")
+        cols = populated_db.search_columnar(q, k=3)
+        rows = populated_db.search(q, k=3)
+        assert cols["ids"].tolist() == [r.id for r in rows]
+        assert cols["content"] == [r.metadata.content for r in rows]
+        assert cols["namespace_id"] == [r.metadata.namespace_id for r in rows]
+        assert cols["scores"].dtype == np.float32
+
+    def test_batch_search_rejects_wrong_dim(self, populated_db):
+        with pytest.raises(RuntimeError):
+            populated_db.batch_search(np.zeros((2, 7), dtype=np.float32), k=3)
+
 
 class TestMultimodal:
     def test_add_multiple_modalities(self, populated_db):
@@ -89,6 +110,16 @@ class TestMetadata:
         db.update_importance(id=1, importance=0.99)
         assert db.get_metadata(1).importance == pytest.approx(0.99, abs=0.01)
 
+    def test_update_importance_many(self, db):
+        for i in (1, 2, 3):
+            db.add(id=i, vec=EMBED(str(i)), meta=feather_db.Metadata())
+        db.update_importance_many(np.array([1, 3]), np.array([0.2, 0.8]))
+        assert db.get_metadata(1).importance == pytest.approx(0.2, abs=0.01)
+        assert db.get_metadata(2).importance == pytest.approx(1.0, abs=0.01)
+        assert db.get_metadata(3).importance == pytest.approx(0.8, abs=0.01)
+        with pytest.raises(RuntimeError):
+            db.update_importance_many(np.array([1, 2]), np.array([0.5]))
+
     def test_set_get_attribute(self, db):
         meta = feather_db.Metadata()
         meta.set_attribute("channel", "instagram")
@@ -98,6 +129,26 @@ class TestMetadata:
         assert loaded.get_attribute("channel") == "instagram"
         assert loaded.get_attribute("ctr") == "0.045"
 
+    def test_set_attributes_merges_dict(self, db):
+        meta = feather_db.Metadata()
+        meta.set_attribute("channel", "instagram")
+        meta.set_attributes({"ctr": "0.045", "channel": "tiktok"})
+        db.add(id=1, vec=EMBED("ad"), meta=meta)
+        loaded = db.get_metadata(1)
+        assert loaded.get_attribute("channel") == "tiktok"
+        assert loaded.get_attribute("ctr") == "0.045"
+
+    def test_attributes_and_links_len(self, db):
+        meta = feather_db.Metadata()
+        assert meta.attributes_len == 0 and meta.links_len == 0
+        meta.set_attributes({"a": "1", "b": "2"})
+        db.add(id=1, vec=EMBED("x"), meta=meta)
+        db.add(id=2, vec=EMBED("y"))
+        db.link(1, 2)
+        loaded = db.get_metadata(1)
+        assert loaded.attributes_len == 2
+        assert loaded.links_len == len(loaded.links) == 1
+
     def test_attribute_dict_mutation_is_noop(self, db):
         """Confirm pybind11 gotcha: meta.attributes['k'] = v silently does nothing."""
         meta = feather_db.Metadata()
@@ -149,6 +200,13 @@ class TestScoringDecay:
         db.touch(id=1)
         assert db.get_metadata(1).recall_count == initial + 2
 
+    def test_touch_many_counts_repeats(self, db):
+        for i in (1, 2):
+            db.add(id=i, vec=EMBED(str(i)), meta=feather_db.Metadata())
+        db.touch_many(np.array([1, 1, 1, 2]))
+        assert db.get_metadata(1).recall_count == 3
+        assert db.get_metadata(2).recall_count == 1
+
     def test_search_auto_touches(self, db):
         meta = feather_db.Metadata()
         db.add(id=1, vec=EMBED("hello"), meta=meta)
@@ -76,6 +76,11 @@ class TestAttributeFilter:
         assert len(results) == 1
         assert results[0].id == 2
 
+    def test_chained_attributes_accumulate(self):
+        f = (FilterBuilder().attribute("channel", "instagram")
+             .attribute("region", "eu").attribute("channel", "twitter").build())
+        assert f.attributes_match == {"channel": "twitter", "region": "eu"}
+
 
 class TestImportanceFilter:
     def test_importance_gte(self, diverse_db):
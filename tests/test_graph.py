@@ -1,9 +1,11 @@
 """
 Context Graph tests: link, get_edges, get_incoming, auto_link, context_chain.
 """
+import os
+import numpy as np
 import pytest
 import feather_db
-from feather_db import DB, RelType
+from feather_db import DB, RelType, auto_link_from_matrix
 from .conftest import EMBED, make_embedder
 
 
@@ -46,6 +48,25 @@ class TestEdges:
         assert match is not None
         assert match.rel_type == "blocks_progress"
 
+    def test_link_many_creates_edges(self, populated_db):
+        n = populated_db.link_many(np.array([1, 2, 3]), np.array([4, 5, 6]),
+                                   RelType.SUPPORTS, np.array([0.1, 0.2, 0.3]))
+        assert n == 3
+        match = next(e for e in populated_db.get_edges(2) if e.target_id == 5)
+        assert match.rel_type == RelType.SUPPORTS
+        assert match.weight == pytest.approx(0.2, abs=0.01)
+        assert 3 in [e.source_id for e in populated_db.get_incoming(6)]
+
+    def test_link_many_dedup_and_unknown_source(self, populated_db):
+        populated_db.link(1, 2, rel_type=RelType.PART_OF)
+        n = populated_db.link_many([1, 1, 999], [2, 3, 1], RelType.PART_OF)
+        assert n == 1  # 1->2 exists, 999 is unknown
+        assert all(e.weight == 1.0 for e in populated_db.get_edges(1))
+
+    def test_link_many_length_mismatch(self, populated_db):
+        with pytest.raises(RuntimeError):
+            populated_db.link_many([1, 2], [3], RelType.RELATED_TO)
+
 
 class TestAutoLink:
     def test_auto_link_creates_edges(self, populated_db):
@@ -60,6 +81,16 @@ class TestAutoLink:
         total_edges = sum(len(populated_db.get_edges(i)) for i in range(1, 7))
         assert total_edges < 6  # substantially fewer than full graph
 
+    def test_auto_link_from_matrix(self, populated_db):
+        ids = [1, 2, 3]
+        vecs = np.array([[1, 0, 0], [0.99, 0.1, 0], [0, 0, 1]], dtype=np.float32)
+        n = auto_link_from_matrix(populated_db, ids, vecs, threshold=0.9, k=1)
+        assert n == 2  # 1<->2 only; 3 is orthogonal to both
+        match = next(e for e in populated_db.get_edges(1) if e.target_id == 2)
+        assert match.weight == pytest.approx(0.995, abs=0.01)
+        assert not any(e.rel_type == RelType.RELATED_TO
+                       for e in populated_db.get_edges(3))
+
 
 class TestContextChain:
     def test_context_chain_returns_nodes(self, populated_db):
@@ -104,6 +135,14 @@ class TestGraphJson:
         assert all(n["namespace_id"] == "infra" for n in data["nodes"])
         assert len(data["nodes"]) == 1  # only node 5 is "infra"
 
+    def test_export_graph_json_label_keeps_utf8_whole(self, db):
+        import json
+        meta = feather_db.Metadata()
+        meta.content = "a" + "é" * 40  # byte 60 falls inside a 2-byte character
+        db.add(id=1, vec=EMBED("x"), meta=meta)
+        label = json.loads(db.export_graph_json())["nodes"][0]["label"]
+        assert label == "a" + "é" * 29
+
     def test_visualize_produces_html(self, populated_db, tmp_path):
         from feather_db.graph import visualize
         out = str(tmp_path / "graph.html")
@@ -111,3 +150,61 @@ class TestGraphJson:
         content = open(out).read()
         assert "<html" in content.lower()
         assert "d3" in content.lower()
+
+    def test_visualize_embeds_export_graph(self, populated_db, tmp_path, capsys):
+        import json
+        from feather_db.graph import visualize, export_graph
+        populated_db.link(1, 2, rel_type=RelType.RELATED_TO, weight=0.8)
+        out = str(tmp_path / "graph.html")
+        visualize(populated_db, output_path=out)
+        content = open(out, encoding="utf-8").read()
+        start = content.index("const GRAPH_DATA = ") + len("const GRAPH_DATA = ")
+        embedded = json.loads(content[start:content.index(";\n", start)].replace("<\\/", "</"))
+        assert embedded == export_graph(populated_db)
+        assert "6 nodes  ·  1 edges" in capsys.readouterr().out
+
+    def test_visualize_cdn_d3(self, populated_db, tmp_path):
+        from feather_db.graph import visualize
+        inline, cdn = str(tmp_path / "inline.html"), str(tmp_path / "cdn.html")
+        visualize(populated_db, output_path=inline)
+        visualize(populated_db, output_path=cdn, inline_d3=False)
+        content = open(cdn, encoding="utf-8").read()
+        assert '<script src="https://cdnjs.cloudflare.com/ajax/libs/d3/7.9.0/d3.min.js">' in content
+        assert os.path.getsize(cdn) < os.path.getsize(inline)
+
+    def test_export_graph_trims_labels_and_attributes(self, populated_db):
+        from feather_db.graph import export_graph
+        meta = populated_db.get_metadata(1)
+        meta.set_attribute("channel", "email")
+        populated_db.update_metadata(1, meta)
+        graph = export_graph(populated_db, max_label_chars=10, include_attributes=False)
+        assert all(len(n["label"]) <= 10 for n in graph["nodes"])
+        assert all("attributes" not in n for n in graph["nodes"])
+
+    def test_visualize_counts_ignore_attribute_keys(self, populated_db, tmp_path, capsys):
+        from feather_db.graph import visualize
+        meta = populated_db.get_metadata(1)
+        meta.set_attribute("source", "x")  # first attribute key reads like an edge
+        populated_db.update_metadata(1, meta)
+        populated_db.link(1, 2, rel_type=RelType.RELATED_TO, weight=0.8)
+        visualize(populated_db, output_path=str(tmp_path / "a.html"))
+        visualize(populated_db, output_path=str(tmp_path / "b.html"), max_label_chars=8)
+        out = capsys.readouterr().out
+        assert out.count("6 nodes  ·  1 edges") == 2
+
+    def test_export_graph_prunes_edges(self, populated_db):
+        from feather_db.graph import export_graph
+        for tgt, w in [(2, 0.9), (3, 0.2), (4, 0.6), (5, 0.4)]:
+            populated_db.link(1, tgt, rel_type=RelType.RELATED_TO, weight=w)
+        weights = lambda g: [round(e["weight"], 2) for e in g["edges"]]
+        assert sorted(weights(export_graph(populated_db, min_edge_weight=0.5))) == [0.6, 0.9]
+        assert weights(export_graph(populated_db, max_edges=3)) == [0.9, 0.6, 0.4]
+        assert weights(export_graph(populated_db, min_edge_weight=0.5, max_edges=1)) == [0.9]
+
+    def test_d3_inlined_once_file_appears(self, tmp_path, monkeypatch):
+        from feather_db import graph
+        d3_file = tmp_path / "d3.min.js"
+        monkeypatch.setattr(graph, "_D3_PATHS", (str(d3_file),))
+        assert graph._d3_script_tag() == graph._D3_CDN_TAG
+        d3_file.write_text("/* d3 */")
+        assert graph._d3_script_tag() == b"<script>/* d3 */</script>"
@@ -1,6 +1,7 @@
 """
 MemoryManager, EpisodeManager, WatchManager, ContradictionDetector tests.
 """
+import numpy as np
 import pytest
 import feather_db
 from feather_db import DB, RelType
@@ -37,6 +38,28 @@ class TestMemoryManager:
         # They may share elements but the ordering should differ at high diversity
         assert mmr_ids != sim_ids or True  # permissive: just check it runs
 
+    def test_search_mmr_skips_near_duplicate(self, db):
+        base = EMBED("base")
+        for rid, vec in [(1, base), (2, base + 1e-4), (3, EMBED("other"))]:
+            db.add(id=rid, vec=vec.astype(np.float32))
+        # Query sits on the duplicates; with diversity the 2nd pick is the
+        # dissimilar node, not the copy of the first.
+        results = MemoryManager.search_mmr(db, base, k=2, diversity=0.7)
+        ids = [r.id for r in results]
+        assert ids[0] in (1, 2) and ids[1] == 3
+
+    def test_consolidate_clusters_similar_nodes(self, db):
+        import time
+        for rid, text in [(1, "a"), (2, "a"), (3, "b"), (4, "b"), (5, "c")]:
+            meta = feather_db.Metadata()
+            meta.namespace_id = "ns"
+            meta.timestamp = int(time.time())
+            meta.content = f"{text}{rid}"
+            db.add(id=rid, vec=EMBED(text) + 1e-3 * rid, meta=meta)
+        new_ids = MemoryManager.consolidate(db, "ns", similarity_threshold=0.99)
+        clusters = sorted(sorted(db.get_metadata(i).content.split(" | ")) for i in new_ids)
+        assert clusters == [["a1", "a2"], ["b3", "b4"]]
+
     def test_why_retrieved_keys(self, populated_db):
         why = MemoryManager.why_retrieved(populated_db, 1, EMBED("onboarding"))
         for key in ["node_id", "similarity", "stickiness", "recency", "importance", "final_score"]: